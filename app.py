@@ -7,13 +7,20 @@
   3. 生成されたExcelをダウンロード
 """
 
+import hashlib
 import io
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
 import streamlit as st
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # ページ設定（必ず最初に呼ぶ）
 st.set_page_config(
@@ -23,9 +30,8 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-from pdf_parser import parse_rakuten_pdf, parse_rakuten_excel
-from jquants_api import JQuantsClient, JQuantsScreener, enrich_holdings
-from excel_generator import create_investment_excel
+# pandas・numpy・pdf_parser（pdfplumber）・jquants_api・excel_generator（openpyxl）は重いので、
+# 再実行のたびに読み込まないよう使う箇所でインポートする
 
 
 # ---------------------------------------------------------------------------
@@ -41,7 +47,9 @@ for key, default in [
 
 # ---------------------------------------------------------------------------
 # 認証情報の取得（Streamlit Secrets → .env → サイドバー入力 の優先順）
+# プロセス内で1度だけ読み込み、再実行のたびに secrets / .env を読み直さない
 # ---------------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
 def _load_credentials() -> tuple[str, str]:
     # Streamlit Community Cloud の secrets
     try:
@@ -61,6 +69,67 @@ def _load_credentials() -> tuple[str, str]:
 preset_email, preset_password = _load_credentials()
 
 
+# ---------------------------------------------------------------------------
+# 保有ファイルの解析（同じアップロードファイルは file_id をキーに再利用）
+# ---------------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={UploadedFile: lambda f: f.file_id})
+def _parse_holdings(uploaded_file: UploadedFile) -> "pd.DataFrame":
+    """アップロードされた PDF / Excel / CSV を解析して保有銘柄 DataFrame を返す"""
+    from pdf_parser import parse_rakuten_pdf, parse_rakuten_excel
+
+    suffix = Path(uploaded_file.name).suffix.lower()
+    if suffix == ".pdf":
+        # アップロード済みのバイト列をそのまま pdfplumber に渡す（一時ファイル不要）
+        return parse_rakuten_pdf(io.BytesIO(uploaded_file.getbuffer()))
+
+    # Excel/CSV は拡張子判定と複数エンコーディングでの再読込にパスが必要
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(uploaded_file.getbuffer())
+        tmp_path = tmp.name
+    try:
+        return parse_rakuten_excel(tmp_path)
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# スクリーニング（条件が同じなら結果を1時間再利用）
+# ---------------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_screen(
+    email: str,
+    _password: str,
+    cred_key: str,
+    pbr_max: float,
+    yield_min: float,
+    market_cap_min: float,
+    div_cut_years: int,
+    holdings_codes: tuple[str, ...],
+) -> "tuple[pd.DataFrame, pd.DataFrame]":
+    """
+    J-Quants スクリーニングを実行して (保有銘柄データ, 候補銘柄) を返す。
+    引数をキーにキャッシュする（先頭 _ の _password はハッシュ対象外）。
+    cred_key はメールアドレス + パスワードの SHA-256 で、パスワードが違えばキャッシュを使わない
+    （平文のパスワードをキャッシュキーに含めないため）。
+    """
+    from jquants_api import JQuantsClient, JQuantsScreener
+
+    client = JQuantsClient(email, _password)
+    screener = JQuantsScreener(
+        client=client,
+        pbr_max=pbr_max,
+        yield_min=yield_min,
+        market_cap_min=market_cap_min,
+        div_cut_years=div_cut_years,
+    )
+    return screener.run(holdings_codes=list(holdings_codes))
+
+
+def _credential_key(email: str, password: str) -> str:
+    """認証情報のハッシュ（_run_screen のキャッシュキー用）"""
+    return hashlib.sha256(f"{email}\0{password}".encode("utf-8")).hexdigest()
+
+
 # ---------------------------------------------------------------------------
 # サイドバー
 # ---------------------------------------------------------------------------
@@ -110,19 +179,16 @@ uploaded_file = st.file_uploader(
 if uploaded_file:
     st.success(f"✅ {uploaded_file.name}")
 
-    # PDF デバッグパネル（解析失敗時に確認用）
-    with st.expander("🔍 PDF 生テキスト確認（解析がうまくいかない場合に展開）"):
+    # PDF デバッグ表示（解析失敗時に確認用）
+    # expander の中身は閉じていても毎回実行されるため、チェックした時だけ PDF を開く
+    if st.checkbox("🔍 PDF 生テキスト確認（解析がうまくいかない場合にチェック）", value=False):
         try:
-            import pdfplumber, io as _io, tempfile
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as _tmp:
-                _tmp.write(uploaded_file.getvalue())
-                _tmp_path = _tmp.name
-            with pdfplumber.open(_tmp_path) as _pdf:
+            import pdfplumber
+            with pdfplumber.open(io.BytesIO(uploaded_file.getbuffer())) as _pdf:
                 for _pn, _pg in enumerate(_pdf.pages[:3]):
                     st.caption(f"--- Page {_pn+1} ---")
                     _txt = _pg.extract_text() or "（テキスト抽出なし）"
                     st.text(_txt[:1500])
-            Path(_tmp_path).unlink(missing_ok=True)
         except Exception as _e:
             st.warning(f"デバッグ表示エラー: {_e}")
 else:
@@ -154,6 +220,9 @@ if not can_run:
 # 分析処理
 # ---------------------------------------------------------------------------
 if run_btn:
+    import numpy as np
+    import pandas as pd
+
     st.session_state.result_excel   = None
     st.session_state.result_summary = None
     holdings_df = pd.DataFrame()
@@ -167,14 +236,7 @@ if run_btn:
             label = "PDF" if suffix == ".pdf" else "Excel/CSV"
             st.write(f"📄 {label} を解析中...")
             try:
-                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-                    tmp.write(uploaded_file.getvalue())
-                    tmp_path = tmp.name
-                if suffix == ".pdf":
-                    holdings_df = parse_rakuten_pdf(tmp_path)
-                else:
-                    holdings_df = parse_rakuten_excel(tmp_path)
-                Path(tmp_path).unlink(missing_ok=True)
+                holdings_df = _parse_holdings(uploaded_file)
                 st.write(f"　→ {len(holdings_df)} 銘柄の保有情報を取得")
             except Exception as e:
                 st.warning(f"　{label}解析に失敗: {e}\n　スクリーニングのみ実行します")
@@ -184,18 +246,20 @@ if run_btn:
         # STEP 2: J-Quants スクリーニング
         st.write("🔍 J-Quants API でスクリーニング中...")
         try:
-            client = JQuantsClient(email, password)
-            screener = JQuantsScreener(
-                client=client,
+            holdings_codes = holdings_df["code"].tolist() if not holdings_df.empty else []
+            jq_holdings_raw, candidates_df = _run_screen(
+                email,
+                password,
+                cred_key=_credential_key(email, password),
                 pbr_max=pbr_max,
                 yield_min=yield_min,
                 market_cap_min=mktcap_min_oku * 1e8,
                 div_cut_years=div_cut_years,
+                holdings_codes=tuple(sorted(holdings_codes)),
             )
-            holdings_codes = holdings_df["code"].tolist() if not holdings_df.empty else []
-            jq_holdings_raw, candidates_df = screener.run(holdings_codes=holdings_codes)
 
             if not holdings_df.empty and not jq_holdings_raw.empty:
+                from jquants_api import enrich_holdings
                 holdings_df = enrich_holdings(holdings_df, jq_holdings_raw)
 
             st.write(f"　→ {len(candidates_df)} 銘柄がスクリーニングを通過")
@@ -219,16 +283,31 @@ if run_btn:
         # STEP 3: Excel 生成
         st.write("📊 Excel を生成中...")
         try:
+            from excel_generator import create_investment_excel
+
             buf = io.BytesIO()
-            create_investment_excel(holdings_df, candidates_df, buf)
+            # openpyxl の書き出しは別スレッドで行い、その間もステータス表示を更新し続ける
+            with ThreadPoolExecutor(max_workers=1) as ex:
+                fut = ex.submit(create_investment_excel, holdings_df, candidates_df, buf)
+                started = time.monotonic()
+                while not fut.done():
+                    status.update(label=f"📊 Excel を生成中... {time.monotonic() - started:.0f}秒")
+                    time.sleep(0.5)
+                fut.result()  # 生成中の例外はここで送出される
             buf.seek(0)
 
             # トップ5候補
             top5 = pd.DataFrame()
             if not candidates_df.empty and "div_yield" in candidates_df.columns:
-                top5 = candidates_df.nlargest(5, "div_yield")
-
-            st.session_state.result_excel = buf.getvalue()
+                # 全件ソートせず argpartition で上位5件だけ選ぶ（NaN は除外）
+                yields = pd.to_numeric(candidates_df["div_yield"], errors="coerce").to_numpy(dtype=float)
+                idx = np.flatnonzero(~np.isnan(yields))
+                if len(idx) > 5:
+                    idx = idx[np.argpartition(-yields[idx], 5)[:5]]
+                top5 = candidates_df.iloc[idx[np.argsort(-yields[idx], kind="stable")]]
+
+            # getvalue() でバイト列を複製せず、BytesIO をそのまま保持してダウンロードに渡す
+            st.session_state.result_excel = buf
             st.session_state.result_summary = {
                 "holdings_count":   len(holdings_df),
                 "candidates_count": len(candidates_df),
@@ -247,7 +326,7 @@ if run_btn:
 # ---------------------------------------------------------------------------
 # 結果表示 & ダウンロード
 # ---------------------------------------------------------------------------
-if st.session_state.result_excel:
+if st.session_state.result_excel is not None:
     s = st.session_state.result_summary
 
     st.success(f"✅ 分析完了（{s['run_time']}）")
@@ -268,8 +347,10 @@ if st.session_state.result_excel:
     )
 
     # 候補銘柄プレビュー
-    top5: pd.DataFrame = s.get("top5", pd.DataFrame())
-    if not top5.empty:
+    top5 = s.get("top5")
+    if top5 is not None and not top5.empty:
+        import pandas as pd
+
         st.subheader("📊 候補銘柄トップ5（配当利回り順）")
 
         def fmt_yield(v):
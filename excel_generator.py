@@ -9,17 +9,22 @@
 
 import io
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import (
     Alignment, Border, Font, PatternFill, Side
 )
-from openpyxl.formatting.rule import ColorScaleRule, CellIsRule
+from openpyxl.formatting.rule import ColorScaleRule, CellIsRule, FormulaRule
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.chart import ScatterChart, Reference, Series
+from openpyxl.chart import ScatterChart
+from openpyxl.chart.data_source import AxDataSource, NumData, NumDataSource, NumVal
+from openpyxl.chart.series import SeriesLabel, XYSeries
 
 
 # ---------------------------------------------------------------------------
@@ -38,66 +43,121 @@ C_ACCENT       = "FFD966"   # アクセント（黄）
 C_BORDER       = "BFBFBF"
 
 
+# スタイルオブジェクトは引数ごとに1つだけ生成して使い回す（openpyxl 側でも共有される）
+@lru_cache(maxsize=None)
 def _thin_border():
     side = Side(style="thin", color=C_BORDER)
     return Border(left=side, right=side, top=side, bottom=side)
 
 
+@lru_cache(maxsize=None)
 def _header_fill(color: str):
     return PatternFill("solid", fgColor=color)
 
 
+@lru_cache(maxsize=None)
 def _header_font():
     return Font(bold=True, color="FFFFFF", size=10)
 
 
+@lru_cache(maxsize=None)
 def _cell_font(bold=False, size=10):
     return Font(bold=bold, size=size)
 
 
+@lru_cache(maxsize=None)
 def _fill(color: str):
     return PatternFill("solid", fgColor=color)
 
 
+@lru_cache(maxsize=None)
+def _dxf_fill(color: str):
+    """条件付き書式用の塗りつぶし（差分書式では bgColor 側が使われるため両方に指定）"""
+    return PatternFill("solid", fgColor=color, bgColor=color)
+
+
+@lru_cache(maxsize=None)
 def _center():
     return Alignment(horizontal="center", vertical="center", wrap_text=False)
 
 
+@lru_cache(maxsize=None)
 def _right():
     return Alignment(horizontal="right", vertical="center")
 
 
-def _auto_width(ws, min_width=8, max_width=40):
-    """列幅を内容に合わせて自動調整"""
-    for col_cells in ws.columns:
-        length = 0
-        for cell in col_cells:
-            if cell.value is not None:
-                length = max(length, len(str(cell.value)))
-        col_letter = get_column_letter(col_cells[0].column)
-        ws.column_dimensions[col_letter].width = max(min_width, min(length + 2, max_width))
+def _auto_width_from_df(ws, df: pd.DataFrame, headers: list[str], min_width=8, max_width=40):
+    """列幅をデータの文字数とヘッダー長から調整（df の列はヘッダーと同じ並び）
+    セルを走査せず DataFrame から計算するので、write-only シートにも書き込み前に適用できる"""
+    if df.empty:
+        lengths = np.zeros(len(headers))
+    else:
+        lengths = df.apply(lambda c: c.dropna().astype(str).str.len().max()).fillna(0).to_numpy()
+    widths = np.maximum(lengths, [len(h) for h in headers])
+    for i, w in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = min(max(int(w) + 2, min_width), max_width)
+
 
+def _title_cell(ws, text: str, color: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=text)
+    cell.font = Font(bold=True, size=12, color=color)
+    cell.alignment = _center()
+    return cell
 
-def _write_header(ws, row: int, headers: list[str], bg_color: str):
-    for col, h in enumerate(headers, 1):
-        cell = ws.cell(row=row, column=col, value=h)
+
+def _write_header(ws, headers: list[str], bg_color: str):
+    cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
         cell.fill = _header_fill(bg_color)
         cell.font = _header_font()
         cell.alignment = _center()
         cell.border = _thin_border()
+        cells.append(cell)
+    ws.append(cells)
 
 
-def _write_data_row(ws, row: int, values: list, alt: bool = False):
-    bg = C_ODD if alt else C_EVEN
-    for col, val in enumerate(values, 1):
-        cell = ws.cell(row=row, column=col, value=val)
-        cell.fill = _fill(bg)
-        cell.font = _cell_font()
-        cell.border = _thin_border()
-        if isinstance(val, (int, float)):
-            cell.alignment = _right()
-        else:
-            cell.alignment = Alignment(horizontal="left", vertical="center")
+# データセルのスタイル（塗り, フォント, 罫線, 配置, 数値書式）。
+# 名前付きスタイルにすると Excel の「セルのスタイル」一覧に残るため、
+# 共有のスタイルオブジェクトをセルに直接設定する（write-only でもブック側で重複は1つにまとめられる）
+_DataStyle = tuple[PatternFill, Font, Border, Alignment, str]
+
+
+@lru_cache(maxsize=None)
+def _data_style(bg: str, alignment: Alignment, number_format: str = "General") -> _DataStyle:
+    return _fill(bg), _cell_font(), _thin_border(), alignment, number_format
+
+
+@lru_cache(maxsize=None)
+def _left():
+    return Alignment(horizontal="left", vertical="center")
+
+
+def _row_styles(bg: str, formats: list) -> tuple[_DataStyle, list[_DataStyle]]:
+    """データ行用の共有スタイル (文字列用, 列ごとの数値用) を返す"""
+    text_style = _data_style(bg, _left())
+    num_styles = [_data_style(bg, _right(), fmt or "General") for fmt in formats]
+    return text_style, num_styles
+
+
+def _data_cells(ws, values: list, styles: tuple[_DataStyle, list[_DataStyle]]) -> list[WriteOnlyCell]:
+    """値リストを型に応じた共有スタイル付きのセルにする
+    （ws.append 前なので呼び出し側で個別セルの色分けを上書きできる）"""
+    text_style, num_styles = styles
+    cells = []
+    for val, num_style in zip(values, num_styles):
+        cell = WriteOnlyCell(ws, value=val)
+        cell.fill, cell.font, cell.border, cell.alignment, cell.number_format = (
+            num_style if isinstance(val, (int, float)) else text_style
+        )
+        cells.append(cell)
+    return cells
+
+
+def _values_array(df: pd.DataFrame, keys: list) -> np.ndarray:
+    """keys の列順に並べた object 配列を返す（欠損値・存在しない列は None）"""
+    arr = df.reindex(columns=keys).to_numpy(dtype=object)
+    return np.where(pd.isna(arr), None, arr)
 
 
 # ---------------------------------------------------------------------------
@@ -127,8 +187,8 @@ def create_investment_excel(
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    wb = Workbook()
-    wb.remove(wb.active)  # デフォルトシートを削除
+    # 行をそのまま XML に書き出す write-only モード（全セルをメモリに保持しない）
+    wb = Workbook(write_only=True)
 
     _write_sheet1_holdings(wb, holdings_df)
     _write_sheet2_candidates(wb, candidates_df)
@@ -182,66 +242,68 @@ _HOLD_NUM_FMT = {
 
 def _write_sheet1_holdings(wb: Workbook, df: pd.DataFrame):
     ws = wb.create_sheet("①保有銘柄一覧")
+    # write-only シートは最初の append より前にレイアウトを確定させる
     ws.freeze_panes = "A2"
-
-    # タイトル
-    ws.merge_cells("A1:L1")
-    title_cell = ws["A1"]
-    title_cell.value = f"保有銘柄一覧  （更新日: {datetime.now().strftime('%Y/%m/%d')}）"
-    title_cell.font = Font(bold=True, size=12, color=C_HEADER_HOLD)
-    title_cell.alignment = _center()
+    ws.merged_cells.add("A1:L1")
     ws.row_dimensions[1].height = 20
-
-    # ヘッダー
-    _write_header(ws, 2, _HOLD_HEADERS, C_HEADER_HOLD)
+    title = f"保有銘柄一覧  （更新日: {datetime.now().strftime('%Y/%m/%d')}）"
 
     if df.empty:
+        ws.append([_title_cell(ws, title, C_HEADER_HOLD)])
+        _write_header(ws, _HOLD_HEADERS, C_HEADER_HOLD)
         ws.append(["データなし"])
         return
 
-    # データ行
-    for i, (_, row) in enumerate(df.iterrows()):
-        r = i + 3
-        values = []
-        for h in _HOLD_HEADERS:
-            col_key = _HOLD_COL_MAP.get(h)
-            val = row.get(col_key) if col_key and col_key in row.index else None
-            # パーセント列は小数に変換（pdfから%が入っている場合）
-            if h in ("評価損益率(%)", "配当利回り(%)") and val is not None:
-                val = _to_pct_decimal(val)
-            values.append(val)
-        _write_data_row(ws, r, values, alt=(i % 2 == 1))
+    # データ行（パーセント列は小数に変換: pdfから%が入っている場合）
+    df = _normalize_pct_columns(df, ["unrealized_pct", "div_yield"])
+    keys = [_HOLD_COL_MAP.get(h) for h in _HOLD_HEADERS]
+    rows = _values_array(df, keys)
 
-        # 評価損益のセルに色を付ける（赤/緑）
-        pl_col = _HOLD_HEADERS.index("評価損益(円)") + 1
-        pl_cell = ws.cell(row=r, column=pl_col)
-        pl_val = pl_cell.value
-        if pl_val is not None:
-            if pl_val >= 0:
-                pl_cell.fill = _fill(C_GAIN)
-                pl_cell.font = Font(color=C_GAIN_FONT, size=10)
-            else:
-                pl_cell.fill = _fill(C_LOSS)
-                pl_cell.font = Font(color=C_LOSS_FONT, size=10)
-
-    # 数値フォーマット適用
-    _apply_number_format(ws, _HOLD_HEADERS, _HOLD_NUM_FMT, start_row=3)
-
-    # 合計行
-    last_data_row = 2 + len(df)
-    summary_row = last_data_row + 2
-    ws.cell(row=summary_row, column=1).value = "合計"
-    ws.cell(row=summary_row, column=1).font = Font(bold=True)
+    # 合計行（データの1行下を空けて SUM 式。行数は書き込み前に確定している）
+    last_data_row = 2 + len(rows)
+    summary = ["合計"] + [None] * (len(_HOLD_HEADERS) - 1)
     for h in ["評価額(円)", "評価損益(円)"]:
-        col_idx = _HOLD_HEADERS.index(h) + 1
-        col_letter = get_column_letter(col_idx)
-        cell = ws.cell(row=summary_row, column=col_idx)
-        cell.value = f"=SUM({col_letter}3:{col_letter}{last_data_row})"
-        cell.font = Font(bold=True)
-        cell.fill = _fill(C_ACCENT)
-        cell.number_format = "#,##0"
+        col_idx = _HOLD_HEADERS.index(h)
+        col_letter = get_column_letter(col_idx + 1)
+        summary[col_idx] = f"=SUM({col_letter}3:{col_letter}{last_data_row})"
 
-    _auto_width(ws)
+    _auto_width_from_df(ws, df.reindex(columns=keys), _HOLD_HEADERS)
+
+    ws.append([_title_cell(ws, title, C_HEADER_HOLD)])
+    _write_header(ws, _HOLD_HEADERS, C_HEADER_HOLD)
+
+    formats = [_HOLD_NUM_FMT.get(h) for h in _HOLD_HEADERS]
+    row_styles = (_row_styles(C_EVEN, formats), _row_styles(C_ODD, formats))
+    # 評価損益の符号を先にまとめて判定（1: 含み益, -1: 含み損, 0: 値なし → 色付けしない）
+    pl_idx = _HOLD_HEADERS.index("評価損益(円)")
+    pl = pd.to_numeric(pd.Series(rows[:, pl_idx], dtype=object), errors="coerce").to_numpy(dtype=float)
+    signs = np.where(np.isnan(pl), 0, np.where(pl >= 0, 1, -1))
+    pl_styles = {
+        1:  (_fill(C_GAIN), Font(color=C_GAIN_FONT, size=10)),
+        -1: (_fill(C_LOSS), Font(color=C_LOSS_FONT, size=10)),
+    }
+
+    for i, values in enumerate(rows):
+        cells = _data_cells(ws, values, row_styles[i % 2])
+
+        # 評価損益のセルに色を付ける（赤/緑）
+        if signs[i]:
+            cells[pl_idx].fill, cells[pl_idx].font = pl_styles[signs[i]]
+        ws.append(cells)
+
+    ws.append([])
+    summary_cells = []
+    for j, val in enumerate(summary):
+        if val is None:
+            summary_cells.append(None)
+            continue
+        cell = WriteOnlyCell(ws, value=val)
+        cell.font = Font(bold=True)
+        if j > 0:
+            cell.fill = _fill(C_ACCENT)
+            cell.number_format = "#,##0"
+        summary_cells.append(cell)
+    ws.append(summary_cells)
 
 
 # ---------------------------------------------------------------------------
@@ -262,7 +324,7 @@ _CAND_COL_MAP = {
     "現在値(円)":     "price",
     "PBR(倍)":        "pbr",
     "配当利回り(%)":  "div_yield",
-    "時価総額(億円)": "market_cap",
+    "時価総額(億円)": "market_cap_oku",
     "年間DPS(円)":    "dps",
     "判定期間":       "period_type",
 }
@@ -279,68 +341,60 @@ _CAND_NUM_FMT = {
 def _write_sheet2_candidates(wb: Workbook, df: pd.DataFrame):
     ws = wb.create_sheet("②新規候補銘柄")
     ws.freeze_panes = "A2"
-
-    ws.merge_cells("A1:J1")
-    title_cell = ws["A1"]
-    title_cell.value = (
+    ws.merged_cells.add("A1:J1")
+    ws.row_dimensions[1].height = 20
+    title = (
         f"スクリーニング結果  （PBR≦{_pbr_label()}倍・配当利回り≧{_yield_label()}%・時価総額≧100億・減配なし）"
         f"  {datetime.now().strftime('%Y/%m/%d')} 現在"
     )
-    title_cell.font = Font(bold=True, size=12, color=C_HEADER_CAND)
-    title_cell.alignment = _center()
-    ws.row_dimensions[1].height = 20
-
-    _write_header(ws, 2, _CAND_HEADERS, C_HEADER_CAND)
 
     if df.empty:
-        ws.cell(row=3, column=1).value = "スクリーニング条件を満たす銘柄がありませんでした"
+        ws.append([_title_cell(ws, title, C_HEADER_CAND)])
+        _write_header(ws, _CAND_HEADERS, C_HEADER_CAND)
+        ws.append(["スクリーニング条件を満たす銘柄がありませんでした"])
         return
 
-    # 配当利回り降順ソート
-    sort_col = "div_yield" if "div_yield" in df.columns else df.columns[0]
-    df_sorted = df.sort_values(sort_col, ascending=False).reset_index(drop=True)
-
-    for i, (_, row) in enumerate(df_sorted.iterrows()):
-        r = i + 3
-        values = []
-        for h in _CAND_HEADERS:
-            col_key = _CAND_COL_MAP.get(h)
-            val = row.get(col_key) if col_key and col_key in row.index else None
-            if h == "時価総額(億円)" and val is not None:
-                val = round(val / 1e8, 1)  # 円 → 億円
-            if h == "配当利回り(%)" and val is not None:
-                val = _to_pct_decimal(val)
-            values.append(val)
-        _write_data_row(ws, r, values, alt=(i % 2 == 1))
-
-        # 配当利回り列を色分け（高いほど濃い緑）
-        yield_col_idx = _CAND_HEADERS.index("配当利回り(%)") + 1
-        yield_cell = ws.cell(row=r, column=yield_col_idx)
-        if yield_cell.value and isinstance(yield_cell.value, float):
-            pct = yield_cell.value * 100
-            if pct >= 5.0:
-                yield_cell.fill = _fill("00B050")
-                yield_cell.font = Font(color="FFFFFF", size=10, bold=True)
-            elif pct >= 4.0:
-                yield_cell.fill = _fill("92D050")
-            elif pct >= 3.0:
-                yield_cell.fill = _fill("C6EFCE")
-
-        # PBR列を色分け（低いほど濃い青）
-        pbr_col_idx = _CAND_HEADERS.index("PBR(倍)") + 1
-        pbr_cell = ws.cell(row=r, column=pbr_col_idx)
-        if pbr_cell.value and isinstance(pbr_cell.value, float):
-            pbr = pbr_cell.value
-            if pbr <= 0.8:
-                pbr_cell.fill = _fill("1F4E79")
-                pbr_cell.font = Font(color="FFFFFF", size=10, bold=True)
-            elif pbr <= 1.0:
-                pbr_cell.fill = _fill("9DC3E6")
-            elif pbr <= 1.3:
-                pbr_cell.fill = _fill("DDEBF7")
-
-    _apply_number_format(ws, _CAND_HEADERS, _CAND_NUM_FMT, start_row=3)
-    _auto_width(ws)
+    df_out = _add_market_cap_oku(_normalize_pct_columns(df, ["div_yield"]))
+    keys = [_CAND_COL_MAP.get(h) for h in _CAND_HEADERS]
+    rows = _values_array(df_out, keys)
+
+    # 配当利回り降順（欠損は末尾）。DataFrame は並べ替えず、行配列を argsort の順に取り出す
+    if "div_yield" in df.columns:
+        yields = pd.to_numeric(df["div_yield"], errors="coerce").fillna(-np.inf).to_numpy()
+        rows = rows[np.argsort(-yields, kind="stable")]
+
+    _auto_width_from_df(ws, df_out.reindex(columns=keys), _CAND_HEADERS)
+
+    ws.append([_title_cell(ws, title, C_HEADER_CAND)])
+    _write_header(ws, _CAND_HEADERS, C_HEADER_CAND)
+
+    formats = [_CAND_NUM_FMT.get(h) for h in _CAND_HEADERS]
+    row_styles = (_row_styles(C_EVEN, formats), _row_styles(C_ODD, formats))
+
+    for i, values in enumerate(rows):
+        ws.append(_data_cells(ws, values, row_styles[i % 2]))
+
+    # 配当利回り・PBR列の色分けは条件付き書式で Excel 側に評価させる
+    last_row = 2 + len(rows)
+    yield_col = get_column_letter(_CAND_HEADERS.index("配当利回り(%)") + 1)
+    pbr_col = get_column_letter(_CAND_HEADERS.index("PBR(倍)") + 1)
+    white_bold = Font(color="FFFFFF", bold=True)
+
+    # 配当利回り列（高いほど濃い緑）
+    yield_range = f"{yield_col}3:{yield_col}{last_row}"
+    for threshold, color, font in [(0.05, "00B050", white_bold), (0.04, "92D050", None), (0.03, "C6EFCE", None)]:
+        ws.conditional_formatting.add(yield_range, CellIsRule(
+            operator="greaterThanOrEqual", formula=[str(threshold)],
+            stopIfTrue=True, fill=_dxf_fill(color), font=font,
+        ))
+
+    # PBR列（低いほど濃い青）。空欄は 0 と評価されるため数値セルに限定する
+    pbr_range = f"{pbr_col}3:{pbr_col}{last_row}"
+    for threshold, color, font in [(0.8, "1F4E79", white_bold), (1.0, "9DC3E6", None), (1.3, "DDEBF7", None)]:
+        ws.conditional_formatting.add(pbr_range, FormulaRule(
+            formula=[f"AND(ISNUMBER({pbr_col}3),{pbr_col}3<={threshold})"],
+            stopIfTrue=True, fill=_dxf_fill(color), font=font,
+        ))
 
 
 # ---------------------------------------------------------------------------
@@ -354,74 +408,53 @@ def _write_sheet3_comparison(
 ):
     ws = wb.create_sheet("③保有vs候補比較")
     ws.freeze_panes = "A2"
-
-    ws.merge_cells("A1:H1")
-    title_cell = ws["A1"]
-    title_cell.value = f"保有銘柄 vs 新規候補  PBR・配当利回り比較  {datetime.now().strftime('%Y/%m/%d')}"
-    title_cell.font = Font(bold=True, size=12, color=C_HEADER_COMP)
-    title_cell.alignment = _center()
+    ws.merged_cells.add("A1:H1")
+    title = f"保有銘柄 vs 新規候補  PBR・配当利回り比較  {datetime.now().strftime('%Y/%m/%d')}"
 
     comp_headers = [
         "区分", "銘柄コード", "銘柄名",
         "現在値(円)", "PBR(倍)", "配当利回り(%)", "時価総額(億円)", "業種"
     ]
-    _write_header(ws, 2, comp_headers, C_HEADER_COMP)
 
-    rows_written = 0
-
-    def add_rows(df, label, bg_color):
-        nonlocal rows_written
+    # 保有・候補を1つの表にまとめ、区分列で背景色を切り替える
+    bg_colors = {"保有中": "DDEBF7", "候補": "E2EFDA"}  # 薄青 / 薄緑
+    frames = []
+    for df, label in [(holdings_df, "保有中"), (candidates_df.head(30), "候補")]:
         if df.empty:
-            return
-        price_col = "current_price" if "current_price" in df.columns else "price"
-        for _, row in df.iterrows():
-            r = rows_written + 3
-            div_yield = row.get("div_yield")
-            if div_yield is not None:
-                div_yield = _to_pct_decimal(div_yield)
-            mktcap = row.get("market_cap")
-            if mktcap is not None:
-                mktcap = round(mktcap / 1e8, 1)
-            values = [
-                label,
-                row.get("code"),
-                row.get("name"),
-                row.get(price_col),
-                row.get("pbr"),
-                div_yield,
-                mktcap,
-                row.get("sector17"),
-            ]
-            for col, val in enumerate(values, 1):
-                cell = ws.cell(row=r, column=col, value=val)
-                cell.fill = _fill(bg_color)
-                cell.font = _cell_font()
-                cell.border = _thin_border()
-                if isinstance(val, (int, float)):
-                    cell.alignment = _right()
-                else:
-                    cell.alignment = Alignment(horizontal="left", vertical="center")
-            rows_written += 1
-
-    add_rows(holdings_df, "保有中", "DDEBF7")  # 薄青
-    add_rows(candidates_df.head(30), "候補", "E2EFDA")  # 薄緑
+            continue
+        price = df["current_price"] if "current_price" in df.columns else df.get("price")
+        frames.append(df.assign(_label=label, _price=price))
+    keys = ["_label", "code", "name", "_price", "pbr", "div_yield", "market_cap_oku", "sector17"]
+    comp = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=keys)
+    comp = _add_market_cap_oku(_normalize_pct_columns(comp, ["div_yield"]))
+    rows = _values_array(comp, keys)
+
+    _auto_width_from_df(ws, comp.reindex(columns=keys), comp_headers)
+
+    ws.append([_title_cell(ws, title, C_HEADER_COMP)])
+    _write_header(ws, comp_headers, C_HEADER_COMP)
 
     # 数値フォーマット
-    _apply_number_format(ws, comp_headers, {
+    num_fmt = {
         "現在値(円)":     "#,##0",
         "PBR(倍)":        "0.00",
         "配当利回り(%)":  "0.00%",
         "時価総額(億円)": "#,##0",
-    }, start_row=3)
+    }
+    formats = [num_fmt.get(h) for h in comp_headers]
+    styles = {label: _row_styles(color, formats) for label, color in bg_colors.items()}
+    for values in rows:
+        ws.append(_data_cells(ws, values, styles[values[0]]))
 
     # 散布図: PBR vs 配当利回り
-    _add_scatter_chart(ws, rows_written, len(holdings_df))
+    pbr_idx, yield_idx = comp_headers.index("PBR(倍)"), comp_headers.index("配当利回り(%)")
+    _add_scatter_chart(ws, rows[:, pbr_idx], rows[:, yield_idx], len(holdings_df))
 
-    _auto_width(ws)
 
-
-def _add_scatter_chart(ws, total_rows: int, holdings_count: int):
-    """PBR vs 配当利回りの散布図を追加"""
+def _add_scatter_chart(ws, pbr: np.ndarray, yields: np.ndarray, holdings_count: int):
+    """PBR vs 配当利回りの散布図を追加
+    系列データはシートのセル参照ではなく、値をそのままチャートに埋め込む"""
+    total_rows = len(pbr)
     if total_rows < 2:
         return
 
@@ -435,68 +468,56 @@ def _add_scatter_chart(ws, total_rows: int, holdings_count: int):
     chart.width = 18
     chart.height = 14
 
-    data_start_row = 3
-    pbr_col = 5   # E列
-    yield_col = 6  # F列
+    def make_series(sl: slice, title: str, symbol: str, size: int) -> XYSeries:
+        series = XYSeries(
+            xVal=AxDataSource(numLit=_num_literal(pbr[sl])),
+            yVal=NumDataSource(numLit=_num_literal(yields[sl])),
+            tx=SeriesLabel(v=title),
+        )
+        series.marker.symbol = symbol
+        series.marker.size = size
+        series.graphicalProperties.line.noFill = True
+        return series
 
     # 保有銘柄シリーズ
     if holdings_count > 0:
-        xvalues_hold = Reference(ws, min_col=pbr_col,
-                                  min_row=data_start_row,
-                                  max_row=data_start_row + holdings_count - 1)
-        yvalues_hold = Reference(ws, min_col=yield_col,
-                                  min_row=data_start_row,
-                                  max_row=data_start_row + holdings_count - 1)
-        series_hold = Series(yvalues_hold, xvalues_hold, title="保有銘柄")
-        series_hold.marker.symbol = "diamond"
-        series_hold.marker.size = 8
-        series_hold.graphicalProperties.line.noFill = True
-        chart.series.append(series_hold)
+        chart.series.append(make_series(slice(0, holdings_count), "保有銘柄", "diamond", 8))
 
     # 候補銘柄シリーズ
-    cand_start = data_start_row + holdings_count
-    cand_end = data_start_row + total_rows - 1
-    if cand_end >= cand_start:
-        xvalues_cand = Reference(ws, min_col=pbr_col,
-                                  min_row=cand_start, max_row=cand_end)
-        yvalues_cand = Reference(ws, min_col=yield_col,
-                                  min_row=cand_start, max_row=cand_end)
-        series_cand = Series(yvalues_cand, xvalues_cand, title="新規候補")
-        series_cand.marker.symbol = "circle"
-        series_cand.marker.size = 6
-        series_cand.graphicalProperties.line.noFill = True
-        chart.series.append(series_cand)
+    if total_rows > holdings_count:
+        chart.series.append(make_series(slice(holdings_count, None), "新規候補", "circle", 6))
 
     ws.add_chart(chart, "J2")
 
 
+def _num_literal(values) -> NumData:
+    """数値の並びをチャート埋め込み用の NumData にする（欠損値の点は省く）"""
+    pts = [NumVal(idx=i, v=float(v)) for i, v in enumerate(values) if v is not None]
+    return NumData(ptCount=len(values), pt=pts)
+
+
 # ---------------------------------------------------------------------------
 # ユーティリティ
 # ---------------------------------------------------------------------------
 
-def _apply_number_format(ws, headers: list[str], fmt_map: dict, start_row: int):
-    """数値列に書式を適用"""
-    for h, fmt in fmt_map.items():
-        if h not in headers:
+def _normalize_pct_columns(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """パーセント列を小数に変換したコピーを返す（例: 3.5 → 0.035）
+    PDFから読んだ値（3.5）と計算済み値（0.035）の両方に対応"""
+    df = df.copy()
+    for c in cols:
+        if c not in df.columns:
             continue
-        col_idx = headers.index(h) + 1
-        col_letter = get_column_letter(col_idx)
-        for cell in ws[col_letter][start_row - 1:]:
-            if cell.value is not None:
-                cell.number_format = fmt
+        s = pd.to_numeric(df[c], errors="coerce")
+        # 1より大きければパーセント表記 → 小数に変換
+        df[c] = s.where(s <= 1, s / 100)
+    return df
 
 
-def _to_pct_decimal(val) -> float | None:
-    """パーセント値を小数に変換（例: 3.5 → 0.035）
-    PDFから読んだ値（3.5）と計算済み値（0.035）の両方に対応"""
-    if val is None:
-        return None
-    try:
-        f = float(val)
-        # 1より大きければパーセント表記 → 小数に変換
-        return f / 100 if f > 1 else f
-    except (TypeError, ValueError):
-        return None
+def _add_market_cap_oku(df: pd.DataFrame) -> pd.DataFrame:
+    """時価総額（円）から億円単位の market_cap_oku 列を追加する"""
+    if "market_cap" in df.columns:
+        df["market_cap_oku"] = (pd.to_numeric(df["market_cap"], errors="coerce") / 1e8).round(1)
+    return df
 
 
 def _pbr_label() -> str:
@@ -12,19 +12,128 @@ J-Quants APIドキュメント: https://jpx-jquants.com/
 """
 
 import logging
+import random
+import re
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://api.jquants.com/v1"
+_USER_AGENT = f"investment-tool/1.0 {requests.utils.default_user_agent()}"
 
 # TypeOfCurrentPeriod の優先順位（年次 > 半期 > 四半期）
 _PERIOD_PRIORITY = {"FY": 0, "2Q": 1, "Q3": 2, "Q1": 3}
 
+# スクリーニング用DataFrameで Arrow 文字列として保持する列
+_STR_COLS = ["code", "name", "sector17", "sector33", "market", "period_type"]
+
+# APIエラーメッセージ中の日付（YYYY-MM-DD）
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# APIレスポンスのディスクキャッシュ（1日以内に取得したものは再利用）
+_CACHE_DIR = Path(__file__).parent / "data" / "cache"
+_CACHE_TTL = timedelta(days=1)
+
+# 並列取得時の同時実行数
+_MAX_WORKERS = 8
+
+# APIリクエストのレート上限（全スレッド合計）: 平常時 _RATE_PER_SEC 回/秒、瞬間的には _RATE_BURST 回まで
+_RATE_PER_SEC = 5.0
+_RATE_BURST = 5
+
+
+# リトライ待機（指数バックオフ + フルジッター）の基準秒数と上限
+_BACKOFF_BASE = 1.0
+_BACKOFF_BASE_429 = 5.0   # 429 で Retry-After がない場合
+_BACKOFF_CAP = 60.0
+
+
+def _backoff(attempt: int, base: float = _BACKOFF_BASE) -> float:
+    """0 〜 min(上限, base * 2^attempt) 秒の一様乱数（リトライが同時に集中しないようにする）"""
+    return random.uniform(0, min(_BACKOFF_CAP, base * 2 ** attempt))
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """Retry-After ヘッダー（秒数 または HTTP日付）を待機秒数にする。なければ None"""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_cache(path: Path) -> pd.DataFrame | None:
+    """有効期限内のキャッシュがあれば読み込む（なければ None）"""
+    try:
+        if datetime.now() - datetime.fromtimestamp(path.stat().st_mtime) < _CACHE_TTL:
+            return pd.read_parquet(path)
+    except Exception:
+        pass
+    return None
+
+
+def _prune_cache():
+    """有効期限切れのキャッシュファイルを削除する（日付・銘柄ごとのファイルが溜まり続けないように）"""
+    expired = datetime.now() - _CACHE_TTL
+    try:
+        for path in _CACHE_DIR.glob("*.parquet"):
+            try:
+                if datetime.fromtimestamp(path.stat().st_mtime) < expired:
+                    path.unlink()
+            except OSError:
+                pass
+    except OSError as e:
+        logger.debug(f"キャッシュの整理に失敗: {e}")
+
+
+def _write_cache(path: Path, df: pd.DataFrame):
+    """キャッシュを書き込む（失敗しても処理は続行）"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression="zstd")
+    except Exception as e:
+        logger.debug(f"キャッシュ書き込み失敗 {path.name}: {e}")
+
+
+class _RateLimiter:
+    """スレッド間で共有するリーキーバケット型のレート制限
+    枠が残っていれば待たずに通し、使い切ったら rate 回/秒のペースに絞る"""
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            # 枠が負なら、その分が補充されるまでの時間だけ待つ（順番は予約済み）
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
 
 class JQuantsClient:
     """J-Quants API クライアント"""
@@ -34,6 +143,17 @@ class JQuantsClient:
         self.password = password
         self.id_token: str = ""
         self.subscription_end: datetime | None = None  # プランのデータ上限日
+        self._latest_date: str | None = None  # get_latest_trading_date の結果
+
+        # 同一ホストへの接続（TCP/TLS）を使い回すため、セッションを1つだけ持つ
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = _USER_AGENT
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._limiter = _RateLimiter(_RATE_PER_SEC, _RATE_BURST)
+        self._stmt_cache: dict[str, pd.DataFrame] = {}  # 銘柄コード → 財務諸表
+        _prune_cache()
         self._authenticate()
 
     # ------------------------------------------------------------------
@@ -43,7 +163,7 @@ class JQuantsClient:
     def _authenticate(self):
         """リフレッシュトークン → IDトークン の2段階認証"""
         # Step 1: リフレッシュトークン取得
-        resp = requests.post(
+        resp = self.session.post(
             f"{_BASE_URL}/token/auth_user",
             json={"mailaddress": self.email, "password": self.password},
             timeout=30,
@@ -52,27 +172,30 @@ class JQuantsClient:
         refresh_token = resp.json()["refreshToken"]
 
         # Step 2: IDトークン取得
-        resp = requests.post(
+        resp = self.session.post(
             f"{_BASE_URL}/token/auth_refresh",
             params={"refreshtoken": refresh_token},
             timeout=30,
         )
         resp.raise_for_status()
         self.id_token = resp.json()["idToken"]
+        self.session.headers["Authorization"] = f"Bearer {self.id_token}"
         logger.info("J-Quants 認証成功")
 
     def _get(self, endpoint: str, params: dict | None = None) -> dict:
         """認証付きGETリクエスト（リトライ付き）"""
-        headers = {"Authorization": f"Bearer {self.id_token}"}
         url = f"{_BASE_URL}/{endpoint}"
         last_exc: Exception | None = None
 
         for attempt in range(4):
+            self._limiter.wait()  # 全リクエスト共通のレート制限（リトライも含む）
             try:
-                resp = requests.get(url, headers=headers, params=params, timeout=60)
+                resp = self.session.get(url, params=params, timeout=60)
                 if resp.status_code == 429:
-                    wait = 60 * (attempt + 1)
-                    logger.warning(f"レート制限 → {wait}秒待機")
+                    wait = _retry_after(resp)
+                    if wait is None:
+                        wait = _backoff(attempt, _BACKOFF_BASE_429)
+                    logger.warning(f"レート制限 → {wait:.1f}秒待機")
                     time.sleep(wait)
                     continue
                 # 4xx/5xx を例外化する前にレスポンスボディをログ
@@ -81,18 +204,19 @@ class JQuantsClient:
                         f"HTTP {resp.status_code} [{endpoint}] body={resp.text[:200]}"
                     )
                 resp.raise_for_status()
-                return resp.json()
+                # ページ単位で数千件の dict を含むため、標準 json より高速な orjson でバイト列から直接パースする
+                return orjson.loads(resp.content)
             except requests.exceptions.HTTPError as e:
                 last_exc = e
                 # 4xx は基本リトライしない（5xx のみリトライ）
                 if resp.status_code < 500:
                     raise
                 logger.warning(f"サーバーエラー {resp.status_code}、リトライ ({attempt+1}/4)")
-                time.sleep(10 * (attempt + 1))
+                time.sleep(_backoff(attempt))
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
                 last_exc = e
                 logger.warning(f"通信エラー (試行 {attempt+1}/4): {e}")
-                time.sleep(10)
+                time.sleep(_backoff(attempt))
 
         raise RuntimeError(f"APIリクエスト失敗 [{endpoint}]: {last_exc}")
 
@@ -107,7 +231,6 @@ class JQuantsClient:
             if not pagination_key:
                 break
             params = {**params, "pagination_key": pagination_key}
-            time.sleep(0.2)
         return results
 
     # ------------------------------------------------------------------
@@ -115,47 +238,72 @@ class JQuantsClient:
     # ------------------------------------------------------------------
 
     def get_listed_info(self) -> pd.DataFrame:
-        """全上場銘柄情報を取得"""
-        items = self._get_paginated("listed/info", "info")
-        df = pd.DataFrame(items)
+        """全上場銘柄情報を取得（同じ日の再実行ではディスク（data/cache）から返す）"""
+        path = _CACHE_DIR / f"listed_{datetime.now().strftime('%Y%m%d')}.parquet"
+        df = _read_cache(path)
+        if df is None:
+            df = pd.DataFrame(self._get_paginated("listed/info", "info"))
+            if not df.empty:
+                _write_cache(path, df)
         logger.info(f"上場銘柄数: {len(df)}")
         return df
 
     def get_daily_quotes(self, date: str) -> pd.DataFrame:
-        """指定日の全銘柄株価を取得 (YYYYMMDD)"""
-        items = self._get_paginated("prices/daily_quotes", "daily_quotes", {"date": date})
-        return pd.DataFrame(items)
+        """指定日の全銘柄株価を取得 (YYYYMMDD)。1日以内の再実行ではディスク（data/cache）から返す"""
+        path = _CACHE_DIR / f"quotes_{date}.parquet"
+        df = _read_cache(path)
+        if df is None:
+            df = pd.DataFrame(self._get_paginated("prices/daily_quotes", "daily_quotes", {"date": date}))
+            if not df.empty:  # 休場日・未確定の空結果はキャッシュしない
+                _write_cache(path, df)
+        return df
 
     def get_statements_for_date(self, date: str) -> list[dict]:
         """指定開示日の財務諸表を全銘柄分取得"""
         return self._get_paginated("fins/statements", "statements", {"date": date})
 
     def get_statements_for_code(self, code: str) -> pd.DataFrame:
-        """特定銘柄の財務諸表を全期間取得（減配チェック用）"""
-        items = self._get_paginated("fins/statements", "statements", {"code": code})
-        return pd.DataFrame(items)
+        """
+        特定銘柄の財務諸表を全期間取得（減配チェック用）。
+        同じクライアント内ではメモリ、1日以内の再実行ではディスク（data/cache）から返す。
+        """
+        if code in self._stmt_cache:
+            return self._stmt_cache[code]
+
+        path = _CACHE_DIR / f"stmt_{code}.parquet"
+        df = _read_cache(path)
+        if df is None:
+            items = self._get_paginated("fins/statements", "statements", {"code": code})
+            df = pd.DataFrame(items)
+            if not df.empty:  # 新規上場・取得失敗の空結果はキャッシュしない
+                _write_cache(path, df)
+        self._stmt_cache[code] = df
+        return df
 
     def get_latest_trading_date(self) -> str:
         """
         最新の取引日を取得。
         Lightプランなどでデータ上限日が存在する場合は、
         エラーメッセージから上限日を自動検出してその日付から検索する。
+        その日の全銘柄株価（get_daily_quotes）が1件でもあれば取引日と判定し、結果は記憶する。
+        取得した株価はディスクキャッシュに残るため、スクリーニング側で再取得しない。
         """
-        import re as _re
-        from datetime import timezone
+        if self._latest_date:
+            return self._latest_date
+
         JST = timezone(timedelta(hours=9))
         today = datetime.now(JST).replace(tzinfo=None)
 
         # まず今日の日付で試して、サブスクリプション上限日を検出する
         search_from = today
         try:
-            data = self._get("prices/daily_quotes", {"date": today.strftime("%Y%m%d")})
-            if data.get("daily_quotes"):
-                return today.strftime("%Y%m%d")
+            if not self.get_daily_quotes(today.strftime("%Y%m%d")).empty:
+                self._latest_date = today.strftime("%Y%m%d")
+                return self._latest_date
         except requests.exceptions.HTTPError as e:
             if e.response is not None and e.response.status_code == 400:
                 # "covers the following dates: 2023-12-02 ~ 2025-12-02" から上限日を取得
-                found = _re.findall(r"\d{4}-\d{2}-\d{2}", e.response.text)
+                found = _DATE_RE.findall(e.response.text)
                 if len(found) >= 2:
                     sub_end = datetime.strptime(found[-1], "%Y-%m-%d")
                     logger.warning(
@@ -172,15 +320,14 @@ class JQuantsClient:
         for i in range(14):
             candidate = (search_from - timedelta(days=i)).strftime("%Y%m%d")
             try:
-                data = self._get("prices/daily_quotes", {"date": candidate})
-                if data.get("daily_quotes"):
+                if not self.get_daily_quotes(candidate).empty:
                     logger.info(f"最新取引日: {candidate}")
+                    self._latest_date = candidate
                     return candidate
                 logger.debug(f"{candidate}: daily_quotes が空（休場日）")
             except Exception as e:
                 errors.append(f"{candidate}: {e}")
                 logger.warning(f"取引日チェック失敗 {candidate}: {e}")
-            time.sleep(0.3)
 
         detail = "\n".join(errors[-5:]) if errors else "なし"
         raise RuntimeError(
@@ -203,30 +350,35 @@ class JQuantsClient:
         """
         # subscription_end があればそこから、なければ今日から起算
         today = self.subscription_end or datetime.now()
-        all_statements: list[dict] = []
+        frames: list[pd.DataFrame] = []
 
         # 週次でサンプリング（APIコール数を抑える）
-        scan_dates = []
-        for i in range(0, days_back, 3):
-            d = (today - timedelta(days=i))
-            if d.weekday() < 5:  # 平日のみ
-                scan_dates.append(d.strftime("%Y%m%d"))
+        # 土日に当たる日は直前の平日に寄せる（重複は除外、順序は新しい日付から）
+        offsets = np.arange(0, days_back, 3).astype("timedelta64[D]")
+        bdays = np.busday_offset(np.datetime64(today.date()) - offsets, 0, roll="backward")
+        scan_dates = list(dict.fromkeys(str(d).replace("-", "") for d in bdays))
 
-        total = len(scan_dates)
-        for idx, date in enumerate(scan_dates):
-            if idx % 10 == 0:
-                logger.info(f"  財務諸表スキャン: {idx}/{total} 日付処理済み")
+        def fetch(date: str) -> pd.DataFrame:
+            # 日付ごとにすぐ DataFrame 化し、巨大な dict のリストを溜め込まない
             try:
-                day_data = self.get_statements_for_date(date)
-                all_statements.extend(day_data)
-                time.sleep(0.3)
+                return pd.DataFrame(self.get_statements_for_date(date))
             except Exception as e:
                 logger.debug(f"  {date}: {e}")
+                return pd.DataFrame()
 
-        if not all_statements:
+        # 日付ごとの取得は通信待ちが大半なので並列に投げる（結果は日付順のまま結合）
+        total = len(scan_dates)
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+            for idx, day_data in enumerate(ex.map(fetch, scan_dates)):
+                if idx % 10 == 0:
+                    logger.info(f"  財務諸表スキャン: {idx}/{total} 日付処理済み")
+                if not day_data.empty:
+                    frames.append(day_data)
+
+        if not frames:
             raise RuntimeError("財務諸表データを取得できませんでした")
 
-        df = pd.DataFrame(all_statements)
+        df = pd.concat(frames, ignore_index=True)
         df = self._keep_latest_statements(df)
         logger.info(f"財務諸表取得完了: {len(df)} 銘柄")
         return df
@@ -252,6 +404,11 @@ class JQuantsClient:
         return df
 
 
+def _project_rename(df: pd.DataFrame, columns: dict[str, str]) -> pd.DataFrame:
+    """columns のキーにある列だけを取り出し、値の名前に変更する（存在しない列は無視）"""
+    return df[[c for c in columns if c in df.columns]].rename(columns=columns)
+
+
 # ------------------------------------------------------------------
 # スクリーニング関数
 # ------------------------------------------------------------------
@@ -286,16 +443,23 @@ class JQuantsScreener:
         -------
         (holdings_df, candidates_df)
         """
-        print("【1/4】上場銘柄一覧を取得中...")
-        listed = self.client.get_listed_info()
+        # 上場銘柄一覧・株価・財務諸表の取得は互いに独立なので並列に行う
+        # （財務諸表のスキャン起点は取引日判定で得るプラン上限日に依存するため、取引日の確定後に投げる）
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            print("【1/4】上場銘柄一覧を取得中...")
+            f_listed = ex.submit(self.client.get_listed_info)
 
-        print("【2/4】最新株価を取得中...")
-        latest_date = self.client.get_latest_trading_date()
-        print(f"  取引日: {latest_date}")
-        prices = self.client.get_daily_quotes(latest_date)
+            print("【2/4】最新株価を取得中...")
+            latest_date = self.client.get_latest_trading_date()
+            print(f"  取引日: {latest_date}")
+            f_prices = ex.submit(self.client.get_daily_quotes, latest_date)
 
-        print("【3/4】財務諸表データを収集中 (数分かかります)...")
-        statements = self.client.collect_recent_statements(days_back=120)
+            print("【3/4】財務諸表データを収集中 (数分かかります)...")
+            f_statements = ex.submit(self.client.collect_recent_statements, days_back=120)
+
+            listed = f_listed.result()
+            prices = f_prices.result()
+            statements = f_statements.result()
 
         print("【4/4】スクリーニング処理中...")
         merged = self._merge_all(listed, prices, statements)
@@ -324,18 +488,18 @@ class JQuantsScreener:
     ) -> pd.DataFrame:
         """上場情報・株価・財務を結合してスクリーニング用DataFrameを作成"""
 
-        # --- 列名の正規化 ---
-        listed = listed.rename(columns={
-            "Code": "code",
+        # --- 必要な列だけに絞ってから列名の正規化 ---
+        # statements は50列以上あるため、rename・merge の前に射影して中間コピーを小さくする
+        listed_code_col = "Code" if "Code" in listed.columns else "LocalCode"
+        listed = _project_rename(listed, {
+            listed_code_col: "code",
             "CompanyName": "name",
             "Sector17CodeName": "sector17",
             "Sector33CodeName": "sector33",
             "MarketCodeName": "market",
         })
-        if "code" not in listed.columns and "LocalCode" in listed.columns:
-            listed = listed.rename(columns={"LocalCode": "code"})
 
-        prices = prices.rename(columns={
+        prices = _project_rename(prices, {
             "Code": "code",
             "Close": "close",
             "AdjustmentClose": "adj_close",
@@ -344,7 +508,7 @@ class JQuantsScreener:
         })
 
         stmt_code_col = "Code" if "Code" in statements.columns else "LocalCode"
-        statements = statements.rename(columns={
+        statements = _project_rename(statements, {
             stmt_code_col: "code",
             "BookValuePerShare": "bps",
             "ResultDividendPerShareAnnual": "dps_result",
@@ -357,15 +521,11 @@ class JQuantsScreener:
 
         # コード列の型統一
         # fins/statements の LocalCode は5桁（例: "14140"）
-        # listed/info・prices は4桁（例: "1414"）なので末尾1桁を除いて統一
-        for df in [listed, prices]:
+        # listed/info・prices は4桁（例: "1414"）なので先頭4桁に揃える（4桁はそのまま）
+        # 文字列列は Arrow 文字列（string[pyarrow]）に揃え、.str 演算・結合を Arrow のカーネルで行う
+        for df in [listed, prices, statements]:
             if "code" in df.columns:
-                df["code"] = df["code"].astype(str).str.strip().str[:4]
-        if "code" in statements.columns:
-            statements["code"] = (
-                statements["code"].astype(str).str.strip()
-                .apply(lambda x: x[:4] if len(x) == 5 else x)
-            )
+                df["code"] = df["code"].astype(str).astype("string[pyarrow]").str.strip().str[:4]
 
         # 株価は実際のClose（非調整）を使用
         # AdjustmentCloseは株式分割で実株価より低くなるため、
@@ -378,15 +538,16 @@ class JQuantsScreener:
             statements.get("fy_end_date", pd.Series(dtype=str))
         )
 
-        # マージ
-        df = listed[["code", "name", "sector17", "sector33", "market"]].merge(
-            prices[["code", "price", "volume"]],
-            on="code", how="left"
-        ).merge(
-            statements[["code", "bps", "dps_result", "dps_forecast",
-                         "shares_outstanding", "period_type", "disclosed_date"]],
-            on="code", how="left"
-        )
+        # マージ（code をインデックスにして join し、キーのハッシュ化を使い回す）
+        df = listed.set_index("code")[["name", "sector17", "sector33", "market"]].join(
+            prices.set_index("code")[["price", "volume"]],
+            how="left"
+        ).join(
+            statements.set_index("code")[["bps", "dps_result", "dps_forecast",
+                                          "shares_outstanding", "period_type", "disclosed_date"]],
+            how="left"
+        ).reset_index()
+        df = df.astype({col: "string[pyarrow]" for col in _STR_COLS})
 
         # 数値変換
         for col in ["price", "bps", "dps_result", "dps_forecast", "shares_outstanding"]:
@@ -400,7 +561,7 @@ class JQuantsScreener:
             df["shares_outstanding"] = df["shares_outstanding"] / adj
 
         # DPS: 結果値を優先、なければ予測値
-        df["dps"] = df["dps_result"].combine_first(df["dps_forecast"])
+        df["dps"] = df["dps_result"].fillna(df["dps_forecast"])
 
         # PBR, 配当利回り, 時価総額を計算
         df["pbr"] = df["price"] / df["bps"]
@@ -460,7 +621,6 @@ class JQuantsScreener:
                     for code, r in zip(codes, ratio):
                         if code not in adj_factors and pd.notna(r):
                             adj_factors[code] = float(r)
-                    time.sleep(0.3)
                     break  # この fy_end に対して有効な取引日が見つかった
                 except Exception as e:
                     logger.debug(f"  分割チェック {check_date}: {e}")
@@ -485,7 +645,8 @@ class JQuantsScreener:
         df = df[df["market_cap"] >= self.market_cap_min]
 
         # ETFや外国株など除外（コードが4桁数字のもののみ）
-        df = df[df["code"].str.match(r"^\d{4}$")]
+        mask = df["code"].str.len().eq(4) & df["code"].str.isdigit()
+        df = df[mask]
 
         after = len(df)
         logger.info(f"基本フィルタ: {before} → {after} 銘柄")
@@ -501,62 +662,69 @@ class JQuantsScreener:
             return df
 
         print(f"  減配チェック中 ({len(df)} 銘柄)... ", end="", flush=True)
-        results = []
 
-        for _, row in df.iterrows():
-            code = row["code"]
-            try:
-                no_cut = self._has_no_dividend_cut(code)
-                if no_cut:
-                    results.append(True)
-                else:
-                    results.append(False)
-                time.sleep(0.3)
-            except Exception as e:
-                logger.debug(f"  {code} 減配チェック失敗: {e}")
-                results.append(True)  # エラー時はフィルタしない（保守的）
+        # 通信（財務諸表の取得）と判定を分離する。取得はまとめて並列に行い、判定はローカルのみ
+        codes = df["code"].tolist()
+        statements = self._fetch_many_statements(codes)
+        try:
+            cut_codes = self._dividend_cut_codes(statements)
+        except Exception as e:
+            logger.debug(f"  減配チェック失敗: {e}")
+            cut_codes = set()  # エラー時はフィルタしない（保守的）
 
-        df = df[results].copy()
+        df = df[~df["code"].isin(cut_codes)].copy()
         print(f"完了 → {len(df)} 銘柄が減配なし")
         return df
 
-    def _has_no_dividend_cut(self, code: str) -> bool:
+    def _fetch_many_statements(self, codes: list[str]) -> dict[str, pd.DataFrame]:
         """
-        指定銘柄が直近 div_cut_years 年間で減配していないか確認。
-        年次DPS（ResultDividendPerShareAnnual）を年度ごとに比較。
+        複数銘柄の財務諸表を並列取得して {code: DataFrame} で返す。
+        取得に失敗した銘柄は辞書に含めない（レートはクライアント側で制御）。
         """
-        stmt_df = self.client.get_statements_for_code(code)
-        if stmt_df.empty:
-            return True  # データなし → 判定不可なのでパス
+        def fetch(code: str) -> pd.DataFrame | None:
+            try:
+                return self.client.get_statements_for_code(code)
+            except Exception as e:
+                logger.debug(f"  {code} 財務諸表取得失敗: {e}")
+                return None
 
-        # 年次決算のみ抽出
-        annual_mask = stmt_df.get("TypeOfCurrentPeriod", pd.Series()) == "FY"
-        annual = stmt_df[annual_mask].copy()
-        if annual.empty:
-            return True
+        unique_codes = list(dict.fromkeys(codes))
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+            fetched = ex.map(fetch, unique_codes)
+            return {code: stmt_df for code, stmt_df in zip(unique_codes, fetched) if stmt_df is not None}
 
+    def _dividend_cut_codes(self, statements: dict[str, pd.DataFrame]) -> set[str]:
+        """
+        取得済みの財務諸表から、直近 div_cut_years 年間で減配した銘柄コードを返す。
+        年次DPS（ResultDividendPerShareAnnual）を年度ごとに比較。
+        全銘柄を1つのDataFrameにまとめ、groupby で一括判定する。
+        データなし・データ不足の銘柄は判定不可なのでパス（減配扱いしない）。
+        """
         dps_col = "ResultDividendPerShareAnnual"
-        if dps_col not in annual.columns:
-            return True
-
-        annual = annual.rename(columns={"DisclosedDate": "date"})
-        annual["date"] = pd.to_datetime(annual.get("date"), errors="coerce")
-        annual[dps_col] = pd.to_numeric(annual[dps_col], errors="coerce")
-        annual = annual.sort_values("date", ascending=False)
-
-        # 直近 div_cut_years 年分の年次DPSを取得
-        recent = annual.head(self.div_cut_years)
-        dps_values = recent[dps_col].dropna().tolist()
-
-        if len(dps_values) < 2:
-            return True  # データ不足 → 判定不可なのでパス
-
-        # 前年比較: 減配（直近DPS < 前年DPS）があればFalse
-        for i in range(len(dps_values) - 1):
-            if dps_values[i] < dps_values[i + 1]:
-                return False  # 減配あり
-
-        return True
+        frames = {code: stmt_df for code, stmt_df in statements.items() if not stmt_df.empty}
+        if not frames:
+            return set()
+
+        big = pd.concat(frames, names=["code", None]).reset_index(level="code")
+        if "TypeOfCurrentPeriod" not in big.columns or dps_col not in big.columns:
+            return set()
+
+        # 年次決算のみ抽出し、銘柄ごとに開示日の新しい順に並べる
+        fy = big.loc[big["TypeOfCurrentPeriod"] == "FY", ["code", "DisclosedDate", dps_col]]
+        fy = fy.assign(
+            date=pd.to_datetime(fy["DisclosedDate"], errors="coerce"),
+            dps=pd.to_numeric(fy[dps_col], errors="coerce"),
+        ).sort_values(["code", "date"], ascending=[True, False], kind="stable")
+
+        # 直近 div_cut_years 年分の年次DPS（欠損は除外）
+        recent = fy.groupby("code", sort=False).head(self.div_cut_years)
+        recent = recent[recent["dps"].notna()]
+
+        # 新しい順に並んでいるので、隣り合う行が同じ銘柄で 前年DPS − 直近DPS > 0 なら減配
+        codes = recent["code"].to_numpy()
+        dps = recent["dps"].to_numpy(dtype=float)
+        cut = (np.diff(dps) > 0) & (codes[1:] == codes[:-1])
+        return set(codes[1:][cut])
 
 
 # ------------------------------------------------------------------
@@ -14,9 +14,6 @@ from datetime import datetime
 from pathlib import Path
 
 import config
-from pdf_parser import parse_rakuten_pdf, parse_rakuten_excel, save_to_csv
-from jquants_api import JQuantsClient, JQuantsScreener, enrich_holdings
-from excel_generator import create_investment_excel
 
 
 # ---------------------------------------------------------------------------
@@ -54,6 +51,12 @@ def main():
         print("\n.env ファイルを確認してください（.env.example を参考に）")
         sys.exit(1)
 
+    # pandas・pdfplumber・openpyxl などの重いモジュールは設定チェックを通過してから読み込む
+    import pandas as pd
+    from pdf_parser import parse_rakuten_pdf, parse_rakuten_excel, save_to_csv
+    from jquants_api import JQuantsClient, JQuantsScreener, enrich_holdings
+    from excel_generator import create_investment_excel
+
     output_dir = config.OUTPUT_DIR
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -69,7 +72,7 @@ def main():
         try:
             suffix = config.PDF_PATH.suffix.lower()
             if suffix == ".pdf":
-                holdings_df = parse_rakuten_pdf(config.PDF_PATH)
+                holdings_df = parse_rakuten_pdf(config.PDF_PATH, use_cache=True)
             else:
                 holdings_df = parse_rakuten_excel(config.PDF_PATH)
             print(f"  保有銘柄: {len(holdings_df)} 銘柄")
@@ -87,7 +90,6 @@ def main():
         print(f"  [警告] PDFが見つかりません: {config.PDF_PATH}")
         print("  スクリーニングのみ実行します")
 
-    import pandas as pd
     if holdings_df is None:
         holdings_df = pd.DataFrame()
 
@@ -161,12 +163,11 @@ def main():
         top5 = candidates_df.nlargest(5, "div_yield")[
             ["code", "name", "div_yield", "pbr"]
         ]
-        for _, r in top5.iterrows():
-            yield_pct = r["div_yield"]
+        for code, name, yield_pct, pbr in top5.itertuples(index=False, name=None):
             if yield_pct is not None and yield_pct <= 1:
                 yield_pct *= 100
-            print(f"  {r['code']} {r.get('name', '')[:15]:15s}"
-                  f"  利回り {yield_pct:.2f}%  PBR {r.get('pbr', 0):.2f}倍")
+            print(f"  {code} {name[:15]:15s}"
+                  f"  利回り {yield_pct:.2f}%  PBR {pbr:.2f}倍")
 
 
 if __name__ == "__main__":
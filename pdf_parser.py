@@ -11,17 +11,41 @@
   その場合は parse_rakuten_pdf() 内の COLUMN_PATTERNS を調整してください。
 """
 
+import hashlib
+import io
+import os
 import re
+import time
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-
-import pdfplumber
-import pandas as pd
+from typing import TYPE_CHECKING, BinaryIO, Iterable
+
+# pandas・numpy・pdfplumber は使う関数の中で読み込む（読み込みに数百ミリ秒かかるため）。
+# テーブル・テキスト抽出のワーカープロセスは pandas を使わないので、起動のたびに読み込まずに済む
+if TYPE_CHECKING:
+    import pandas as pd
+    import pdfplumber
+
+try:
+    # テキストだけを読むフォールバックでは、C実装の PDFium の方が pdfminer（pdfplumber）よりずっと速い（任意）
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    # 数値文字列 → float の変換は、fastnumbers があれば float() と例外処理より速い C 実装を使う（任意）
+    from fastnumbers import try_float
+except ImportError:
+    try_float = None
 
 logger = logging.getLogger(__name__)
 
 # ▲ や △ はマイナス（含み損）を意味する
 _MINUS_PREFIXES = ("▲", "△", "－", "−")
+_MINUS_SET = frozenset(_MINUS_PREFIXES)   # 先頭1文字の判定用（startswith でタプルを順に比べるより速い）
 
 # 楽天証券の列名パターン（部分一致・複数バージョン対応）
 _COL_PATTERNS = {
@@ -36,34 +60,152 @@ _COL_PATTERNS = {
     "unrealized_pct":  ["評価損益率", "損益率", "損益(%)"],
 }
 
+# 列名パターン → フィールド名（_COL_PATTERNS の逆引き。順序は _COL_PATTERNS と同じ）
+_PATTERN_TO_FIELD = {p: field for field, patterns in _COL_PATTERNS.items() for p in patterns}
+
+# 解析結果の列（この順で DataFrame を組み立てる）
+_SCHEMA_COLS = ("code", "name", "account_type", "quantity", "avg_cost",
+                "current_price", "assessed_value", "unrealized_pl", "unrealized_pct")
+
+# 数値列の型（_clean_dataframe で変換する）
+_NUMERIC_DTYPES = {col: "float64" for col in _SCHEMA_COLS[3:]}
+
+# ページ数がこれ以上のPDFはテーブル抽出をプロセス並列で行う（小さいPDFはプロセス起動の方が高くつく）
+_PARALLEL_MIN_PAGES = 8
+
+# PDF解析結果のキャッシュ（PDFの内容の SHA-256 で引く）。
+# 解析ロジックの変更で結果が変わる場合は _PDF_CACHE_VERSION を上げて古いキャッシュを無効にする
+# 週次で新しいPDFに置き換わるため、7日より古いキャッシュは使わずに削除する
+_PDF_CACHE_DIR = Path(__file__).parent / "data" / "cache" / "pdf"
+_PDF_CACHE_VERSION = 1
+_PDF_CACHE_TTL = 7 * 24 * 3600  # 秒
+
+# 正規表現（行ごとに呼ばれるためモジュール読み込み時に一度だけコンパイルする）
+_RE_CODE4          = re.compile(r"^\d{4}$")               # 4桁の銘柄コードのみ
+# 4桁コードだけの行、または行頭に4桁コード + 残りがある行（前後の空白は無視、複数行テキストに適用）
+_RE_CODE_LINE      = re.compile(r"(?m)^[^\S\n]*(\d{4})(?:[^\S\n]*$|[^\S\n]+\S.*$)")
+_RE_CODE_PREFIX    = re.compile(r"^\d{4}")                # 4桁コードで始まる
+_RE_CODE_REST      = re.compile(r"^\d{4}\s*")             # 行頭の4桁コード（除去用）
+_RE_NAME_HEAD      = re.compile(r"^([^\d▲△,]{2,40})")     # 先頭の銘柄名らしき部分
+_RE_DIGITS4_LONG   = re.compile(r"[\d,]{4,}")             # 4文字以上の数字列
+_RE_JP             = re.compile(r"[\u3000-\u9fff\uff00-\uffef]")  # 日本語（全角）文字
+_RE_NUM_TOKEN      = re.compile(r"([▲△]?)([\d,]+(?:\.\d+)?)")  # (符号, 数字部分)
+# 単独の4桁数字（金額の一部や「2026年10月15日」「2026/10/15」「2026-10-15」などの日付は除く）
+_RE_CODE_TOKEN     = re.compile(r"(?<![\d,./\-])\d{4}(?![\d,./\-年月日])")
+
+# 数値文字列から取り除く文字（1文字単位の削除は正規表現より str.translate が速い）
+_WHITESPACE = " \t\n\r\x0b\x0c\xa0\u3000"
+_NUM_STRIP_TABLE   = str.maketrans("", "", "▲△,円%" + _WHITESPACE)
+# 全角の数字・小数点は半角に直す（pd.to_numeric は全角数字を解釈できない）
+_FLOAT_STRIP_TABLE = str.maketrans("０１２３４５６７８９．", "0123456789.", ",，円¥￥%％▲△－−" + _WHITESPACE)
+
+# テキスト抽出パターン1: 1行にすべてまとまっている場合
+# 値が改行で区切られたPDFにも一致させるため行単位ではなくページのテキスト全体に適用する（\s+ は改行をまたぐ）。
+# 数字の途中（"12345" の "2345" など）からは照合を始めないよう、直前が数字でない位置に限定する。
+# 数値は半角数字なので (?a) で \d を ASCII に限定して文字クラス判定を軽くする
+# （(?a) では \s が全角スペース・NBSP に一致しなくなるため、区切りの空白は _TEXT_WS で明示する）
+_TEXT_WS = r"[\s\u3000\xa0]+"
+_RE_ONELINE = re.compile(
+    r"(?a)(?<!\d)(\d{4})" + _TEXT_WS +
+    r"([^\d▲△\n]+?)" + _TEXT_WS +
+    r"(?:(特定|一般|NISA|つみたてNISA|成長投資枠|特定口座|一般口座)" + _TEXT_WS + r")?"
+    r"([\d,]+)" + _TEXT_WS +
+    r"([\d,]+(?:\.\d+)?)" + _TEXT_WS +
+    r"([\d,]+(?:\.\d+)?)" + _TEXT_WS +
+    r"([\d,]+)" + _TEXT_WS +
+    r"([▲△]?[\d,]+(?:\.\d+)?)" + _TEXT_WS +
+    r"([▲△]?[\d.]+)"
+)
+
+# セクション見出し（行頭の「国内株式」「■投資信託」「【米国株式】」など）。
+# 銘柄名に含まれる場合（「上場ＳＰ米国株式」など）を拾わないよう、行頭にあり直後が区切りのものに限る
+_DOMESTIC_SECTION = "国内株式"
+_OTHER_SECTIONS = ("米国株式", "外国株式", "中国株式", "アセアン株式", "投資信託",
+                   "国内債券", "外国債券", "外貨建MMF", "金・プラチナ")
+_RE_SECTION = re.compile(
+    r"(?m)^[^\S\n]*[■□●◆【\[]?[^\S\n]*"
+    r"(" + "|".join(map(re.escape, (_DOMESTIC_SECTION,) + _OTHER_SECTIONS)) + r")"
+    r"(?=[^\S\n]|[（(】\]]|$)"
+)
+
+# テキスト抽出でページをまたぐ行に備えて次のページへ持ち越す、前ページ末尾の最大行数
+_TEXT_CARRY_LINES = 12
+
 
 # ---------------------------------------------------------------------------
 # 公開関数
 # ---------------------------------------------------------------------------
 
-def parse_rakuten_pdf(pdf_path: str | Path) -> pd.DataFrame:
+def parse_rakuten_pdf(pdf_path: "str | Path | BinaryIO", use_cache: bool = False) -> "pd.DataFrame":
     """
     楽天証券「保有商品一覧」PDFを解析して国内株式保有銘柄を返す。
 
+    pdf_path にはファイルパスのほか io.BytesIO などのバイナリストリームも渡せる
+    （Streamlit のアップロードファイルを一時ファイルに書かずに解析するため）。
+
+    use_cache=True のときは解析結果を data/cache/pdf に保存し、
+    同じ内容のPDFは pdfplumber を使わずにキャッシュから返す。
+    保有銘柄が平文でディスクに残るため既定では無効（main.py の CLI 実行だけが有効にする。
+    Streamlit 側は st.cache_data でメモリ上にキャッシュする）。
+
     Returns
     -------
     pd.DataFrame
         columns: code, name, account_type, quantity, avg_cost,
                  current_price, assessed_value, unrealized_pl, unrealized_pct
     """
-    path = Path(pdf_path)
-    if not path.exists():
-        raise FileNotFoundError(f"PDFが見つかりません: {path.resolve()}")
-
-    logger.info(f"PDF解析開始: {path.name}")
-
-    with pdfplumber.open(path) as pdf:
-        records = _try_table_extraction(pdf)
-        if not records:
-            logger.warning("テーブル抽出失敗 → テキスト解析にフォールバック")
-            records = _try_text_extraction(pdf)
-
-    if not records:
+    import pdfplumber
+    import pandas as pd
+
+    if isinstance(pdf_path, (str, Path)):
+        source = Path(pdf_path)
+        if not source.exists():
+            raise FileNotFoundError(f"PDFが見つかりません: {source.resolve()}")
+        label = source.name
+    else:
+        source = pdf_path
+        label = getattr(pdf_path, "name", "(stream)")
+
+    logger.info(f"PDF解析開始: {label}")
+
+    cache_path = _pdf_cache_path(source) if use_cache else None
+    if cache_path is not None:
+        df = _read_pdf_cache(cache_path)
+        if df is not None:
+            logger.info(f"  → {len(df)} 銘柄を取得（キャッシュ）")
+            return df
+
+    with pdfplumber.open(source) as pdf:
+        # テキスト解析用のページテキスト（必要になったページだけ抽出し、同じページは抽出し直さない）
+        page_texts: dict[int, str | None] = {}
+        all_pages = [page.page_number for page in pdf.pages]
+        # 外国株式・投資信託などのページは表を読んでも捨てるだけなので、国内株式セクションのページだけを対象にする。
+        # 罫線のないPDFではテーブル抽出が全ページ失敗するが、その場合も残りのページには広げない
+        # （テキスト解析は行の並びだけで判定するため、投資信託などの行も銘柄として拾ってしまう）
+        target_pages = (_domestic_pages(_section_texts(pdf, source, all_pages, page_texts))
+                        if len(all_pages) > 1 else all_pages)
+        records, failed_pages = _extract_tables(pdf, source, target_pages)
+        # 同じコードが複数ページにまたがって抽出された場合は最初の1件だけ残す（テキスト解析の結果とも共通）
+        seen_codes: set[str] = set()
+        records = _dedup_records(records, seen_codes)
+        # 列は決まっているので指定して渡す（各行の辞書から列集合を推定する処理を省き、列順も固定される）
+        df = pd.DataFrame.from_records(records, columns=_SCHEMA_COLS)
+
+        # テーブル抽出できなかったページだけをテキスト解析する（全ページ失敗なら全体が対象）
+        if failed_pages:
+            if records:
+                logger.info(f"テーブル抽出できなかった {len(failed_pages)} ページをテキスト解析")
+            else:
+                logger.warning("テーブル抽出失敗 → テキスト解析にフォールバック")
+            missing = [n for n in failed_pages if n not in page_texts]
+            if missing:
+                page_texts.update(zip(missing, _extract_page_texts(pdf, source, missing)))
+            text_columns = _parse_text_pages(page_texts[n] for n in failed_pages)
+            text_df = pd.DataFrame(_dedup_columns(text_columns, seen_codes))
+            if not text_df.empty:
+                df = pd.concat([df, text_df], ignore_index=True) if records else text_df
+
+    if df.empty:
         raise ValueError(
             "PDFから保有銘柄を抽出できませんでした。\n"
             "  ・楽天証券の「保有商品一覧」PDFか確認してください\n"
@@ -71,13 +213,15 @@ def parse_rakuten_pdf(pdf_path: str | Path) -> pd.DataFrame:
             "  ・問題が続く場合は pdf_parser.py の解析ロジックを調整してください"
         )
 
-    df = pd.DataFrame(records)
-    df = _clean_dataframe(df)
+    # テーブル抽出の値は生の文字列なので、テキスト解析だけの結果のときに限り数値変換を省ける
+    df = _clean_dataframe(df, already_numeric=not records)
+    if cache_path is not None:
+        _write_pdf_cache(cache_path, df)
     logger.info(f"  → {len(df)} 銘柄を取得")
     return df
 
 
-def parse_rakuten_excel(file_path: str | Path) -> pd.DataFrame:
+def parse_rakuten_excel(file_path: str | Path) -> "pd.DataFrame":
     """
     楽天証券「保有商品一覧」Excel または CSV ファイルを解析する。
 
@@ -89,6 +233,8 @@ def parse_rakuten_excel(file_path: str | Path) -> pd.DataFrame:
     -------
     pd.DataFrame  (parse_rakuten_pdf と同じ列構成)
     """
+    import pandas as pd
+
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"ファイルが見つかりません: {path.resolve()}")
@@ -99,14 +245,13 @@ def parse_rakuten_excel(file_path: str | Path) -> pd.DataFrame:
     raw_frames: list[pd.DataFrame] = []
 
     if suffix in (".xlsx", ".xls"):
-        xl = pd.ExcelFile(path)
-        for sheet in xl.sheet_names:
-            try:
-                raw_frames.append(
-                    pd.read_excel(path, sheet_name=sheet, header=None, dtype=str)
-                )
-            except Exception as e:
-                logger.debug(f"シート {sheet} 読み込み失敗: {e}")
+        # ブック（zip + XML）の解析は ExcelFile で1回だけ行い、各シートはそこから読む
+        with pd.ExcelFile(path) as xl:
+            for sheet in xl.sheet_names:
+                try:
+                    raw_frames.append(xl.parse(sheet_name=sheet, header=None, dtype=str))
+                except Exception as e:
+                    logger.debug(f"シート {sheet} 読み込み失敗: {e}")
 
     elif suffix == ".csv":
         for enc in ("utf-8-sig", "cp932", "shift-jis", "utf-8"):
@@ -156,7 +301,7 @@ def parse_rakuten_excel(file_path: str | Path) -> pd.DataFrame:
             "  ・ファイルに「銘柄コード」列が含まれているか確認してください"
         )
 
-    records: list[dict] = []
+    columns = _new_columns()
     for frame in raw_frames:
         # _read_rakuten_csv_section はヘッダー付きDFを返す
         # _extract_from_dataframe は header=None 前提なのでヘッダー行を先頭に追加して変換
@@ -166,16 +311,17 @@ def parse_rakuten_excel(file_path: str | Path) -> pd.DataFrame:
             data_part.columns = range(len(data_part.columns))
             header_row.columns = range(len(header_row.columns))
             frame = pd.concat([header_row, data_part], ignore_index=True)
-        records.extend(_extract_from_dataframe(frame))
+        for col, values in _extract_from_dataframe(frame).items():
+            columns[col].extend(values)
 
-    if not records:
+    if not columns["code"]:
         raise ValueError(
             "Excel/CSVから保有銘柄を抽出できませんでした。\n"
             "  ・楽天証券の「保有商品一覧」をダウンロードしたファイルか確認してください\n"
             "  ・国内株式の行に4桁の銘柄コードが含まれているか確認してください"
         )
 
-    df = pd.DataFrame(records)
+    df = pd.DataFrame(_dedup_columns(columns, set()))
     df = _clean_dataframe(df)
     logger.info(f"  → {len(df)} 銘柄を取得")
     return df
@@ -205,6 +351,7 @@ def _read_rakuten_csv_section(path: Path, encoding: str) -> "pd.DataFrame | None
     楽天証券CSVから「銘柄コード」ヘッダー行と4桁コード行のみを抽出して返す。
     集計行・サマリー行・空行はすべて無視する。
     """
+    import pandas as pd
     import io as _io
 
     with open(path, encoding=encoding, errors="replace") as f:
@@ -232,7 +379,7 @@ def _read_rakuten_csv_section(path: Path, encoding: str) -> "pd.DataFrame | None
         if not stripped:
             continue
         first_cell = stripped.split(sep)[0].strip().strip('"').strip("'")
-        if re.match(r"^\d{4}$", first_cell):
+        if _RE_CODE4.match(first_cell):
             selected.append(stripped)
 
     if len(selected) < 2:
@@ -249,46 +396,46 @@ def _read_rakuten_csv_section(path: Path, encoding: str) -> "pd.DataFrame | None
     return df
 
 
-def _extract_from_dataframe(df: pd.DataFrame) -> list[dict]:
+def _extract_from_dataframe(df: "pd.DataFrame") -> dict[str, list]:
     """
-    任意の DataFrame から銘柄コード行を探して保有銘柄リストを返す。
+    任意の DataFrame から銘柄コード行を探して保有銘柄を列ごとのリスト（{列名: 値のリスト}）で返す。
     ヘッダー行の有無・位置を自動検出する。
     """
-    records: list[dict] = []
+    import numpy as np
+    import pandas as pd
+
+    columns = _new_columns()
+
+    # 行ごとの Series 生成を避けるため、全セルを一度だけ前後の空白を除いた文字列の ndarray に変換しておく
+    arr = df.to_numpy(dtype=object)
+    cells_all = np.char.strip(np.where(pd.isna(arr), "", arr.astype(str)))
 
     # --- ヘッダー行を探す ---
     col_map: dict[str, int] = {}
     header_row_idx: int = -1
 
-    for idx, row in df.iterrows():
-        cells = [str(c).strip() if pd.notna(c) else "" for c in row]
-        tmp_map: dict[str, int] = {}
-        for j, cell in enumerate(cells):
-            for field, patterns in _COL_PATTERNS.items():
-                if field not in tmp_map and any(p in cell for p in patterns):
-                    tmp_map[field] = j
+    for idx in range(cells_all.shape[0]):
+        cells = cells_all[idx].tolist()
+        tmp_map = _match_header(cells)
         # 2列以上マッチしたらヘッダーと判断
         if len(tmp_map) >= 2:
             col_map = tmp_map
-            header_row_idx = int(str(idx))
+            header_row_idx = idx
             break
 
     # --- データ行を抽出 ---
-    for idx, row in df.iterrows():
-        if int(str(idx)) <= header_row_idx:
-            continue
-
-        cells = [str(c).strip() if pd.notna(c) else "" for c in row]
+    for idx in range(header_row_idx + 1, cells_all.shape[0]):
+        cells = cells_all[idx].tolist()
 
         # 4桁コードを探す
         code: str | None = None
         if "code" in col_map:
             candidate = cells[col_map["code"]] if col_map["code"] < len(cells) else ""
-            if re.match(r"^\d{4}$", candidate):
+            if _RE_CODE4.match(candidate):
                 code = candidate
         if not code:
             for c in cells:
-                if re.match(r"^\d{4}$", c):
+                if _RE_CODE4.match(c):
                     code = c
                     break
         if not code:
@@ -302,22 +449,15 @@ def _extract_from_dataframe(df: pd.DataFrame) -> list[dict]:
         if not name:
             continue
 
-        records.append({
-            "code":           code,
-            "name":           name,
-            "account_type":   get("account_type") or "",
-            "quantity":       _to_float(get("quantity")),
-            "avg_cost":       _to_float(get("avg_cost")),
-            "current_price":  _to_float(get("current_price")),
-            "assessed_value": _to_float(get("assessed_value")),
-            "unrealized_pl":  _to_float(get("unrealized_pl")),
-            "unrealized_pct": _to_float(get("unrealized_pct")),
-        })
+        # 数値列は生の文字列のまま渡し、_clean_dataframe で列ごとにまとめて変換する
+        _append_row(columns, code, name, get("account_type") or "",
+                    get("quantity"), get("avg_cost"), get("current_price"),
+                    get("assessed_value"), get("unrealized_pl"), get("unrealized_pct"))
 
-    return records
+    return columns
 
 
-def save_to_csv(df: pd.DataFrame, output_path: str | Path) -> None:
+def save_to_csv(df: "pd.DataFrame", output_path: str | Path) -> None:
     """保有銘柄DataFrameをCSVに保存"""
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -325,14 +465,106 @@ def save_to_csv(df: pd.DataFrame, output_path: str | Path) -> None:
     logger.info(f"CSVに保存: {output_path}")
 
 
+# ---------------------------------------------------------------------------
+# 内部関数: 解析結果キャッシュ
+# ---------------------------------------------------------------------------
+
+def _pdf_cache_path(source: "Path | BinaryIO") -> Path | None:
+    """PDFの内容（バイト列）の SHA-256 からキャッシュファイルのパスを求める"""
+    try:
+        if isinstance(source, Path):
+            data = source.read_bytes()
+        else:
+            pos = source.tell()
+            data = source.read()
+            source.seek(pos)
+    except Exception as e:
+        logger.debug(f"PDFキャッシュのキー計算に失敗: {e}")
+        return None
+    digest = hashlib.sha256(data).hexdigest()
+    return _PDF_CACHE_DIR / f"v{_PDF_CACHE_VERSION}_{digest}.parquet"
+
+
+def _read_pdf_cache(path: Path) -> "pd.DataFrame | None":
+    """キャッシュ済みの解析結果を読み込む（なければ None）"""
+    import pandas as pd
+
+    try:
+        if path.exists() and time.time() - path.stat().st_mtime < _PDF_CACHE_TTL:
+            return pd.read_parquet(path)
+    except Exception as e:
+        logger.debug(f"PDFキャッシュ読み込み失敗 {path.name}: {e}")
+    return None
+
+
+def _write_pdf_cache(path: Path, df: "pd.DataFrame") -> None:
+    """解析結果をキャッシュに書き込む（失敗しても処理は続行）。期限切れ・旧バージョンのキャッシュはここで削除する"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _prune_pdf_cache()
+        df.to_parquet(path, compression="zstd")
+    except Exception as e:
+        logger.debug(f"PDFキャッシュ書き込み失敗 {path.name}: {e}")
+
+
+def _prune_pdf_cache() -> None:
+    """有効期限切れ、または _PDF_CACHE_VERSION が古いキャッシュファイルを削除する"""
+    expired = time.time() - _PDF_CACHE_TTL
+    prefix = f"v{_PDF_CACHE_VERSION}_"
+    for path in _PDF_CACHE_DIR.glob("*.parquet"):
+        try:
+            if not path.name.startswith(prefix) or path.stat().st_mtime < expired:
+                path.unlink()
+        except OSError:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # 内部関数: テーブル抽出
 # ---------------------------------------------------------------------------
 
-def _try_table_extraction(pdf: pdfplumber.PDF) -> list[dict]:
+def _domestic_pages(page_texts: list[str | None]) -> list[int]:
+    """
+    国内株式セクションにあたるページ番号（1始まり）を返す（page_texts は全ページのテキスト）。
+    各ページのテキストから行頭のセクション見出し（国内株式 / 米国株式 / 投資信託 など）を拾い、
+    「国内株式」の見出しがあるページと、最後の見出しが国内株式のページに続くページを対象にする。
+    国内株式の次のセクションが始まるページは、見出しより前に銘柄コードらしき数字があれば
+    （前ページからの続きがあるとみなして）対象に含める。
+    国内株式の見出しが1つもなければ判定できないので全ページを返す。
+    """
+    pages: list[int] = []
+    in_domestic = False
+    found = False
+    for page_number, text in enumerate(page_texts, 1):
+        text = text or ""
+        titles = [(m.start(), m.group(1)) for m in _RE_SECTION.finditer(text)]
+        names = [name for _, name in titles]
+        if _DOMESTIC_SECTION in names:
+            pages.append(page_number)
+        elif in_domestic and (not titles or _RE_CODE_TOKEN.search(text, 0, titles[0][0])):
+            pages.append(page_number)
+        if titles:
+            in_domestic = names[-1] == _DOMESTIC_SECTION
+            found = found or _DOMESTIC_SECTION in names
+    if not found:
+        return list(range(1, len(page_texts) + 1))
+    return pages
+
+
+def _extract_tables(pdf: "pdfplumber.PDF", source: "Path | BinaryIO",
+                    page_numbers: list[int]) -> tuple[list[dict], list[int]]:
+    """指定ページ（1始まり）のテーブル抽出。ページ数が多ければプロセス並列にする"""
+    if _should_parallelize(len(page_numbers)):
+        return _try_table_extraction_parallel(source, page_numbers)
+    return _try_table_extraction(pdf, pages=page_numbers)
+
+
+def _try_table_extraction(pdf: "pdfplumber.PDF", pages: list[int] | None = None) -> tuple[list[dict], list[int]]:
     """
     pdfplumber でテーブル抽出。
     楽天証券PDFは罫線のないレイアウトが多いため、4つの戦略を順に試みる。
+    pages を指定した場合はそのページ（1始まり）だけを対象にする。
+    Returns (records, どの戦略でも抽出できなかったページ番号（1始まり）のリスト)
     """
     # 戦略リスト（strict → 緩い順）
     STRATEGIES = [
@@ -347,12 +579,25 @@ def _try_table_extraction(pdf: pdfplumber.PDF) -> list[dict]:
     ]
 
     records = []
-    for page_num, page in enumerate(pdf.pages):
-        page_text = page.extract_text() or ""
-
-        for strategy in STRATEGIES:
+    failed_pages: list[int] = []
+    # 成功した戦略は同じPDFの他ページでもまず通用するので、次ページ以降は最初に試す
+    winning_idx: int | None = None
+    for page in pdf.pages:
+        if pages is not None and page.page_number not in pages:
+            continue
+        order = list(range(len(STRATEGIES)))
+        if winning_idx is not None:
+            order.remove(winning_idx)
+            order.insert(0, winning_idx)
+        # 罫線を使う戦略は、その向きの罫線が1本もないページでは表を見つけられないので試さない
+        has_edges = {"vertical": bool(page.vertical_edges), "horizontal": bool(page.horizontal_edges)}
+        order = [i for i in order
+                 if all(has_edges[axis] or not STRATEGIES[i][f"{axis}_strategy"].startswith("lines")
+                        for axis in ("vertical", "horizontal"))]
+
+        for strategy_idx in order:
             try:
-                tables = page.extract_tables(table_settings=strategy)
+                tables = page.extract_tables(table_settings=STRATEGIES[strategy_idx])
             except Exception:
                 tables = []
 
@@ -372,9 +617,80 @@ def _try_table_extraction(pdf: pdfplumber.PDF) -> list[dict]:
 
             if found_in_page:
                 records.extend(found_in_page)
+                winning_idx = strategy_idx
                 break  # このページは成功したので次の戦略は不要
+        else:
+            failed_pages.append(page.page_number)
+
+    return records, failed_pages
+
+
+def _try_table_extraction_parallel(source: "Path | BinaryIO",
+                                   page_numbers: list[int]) -> tuple[list[dict], list[int]]:
+    """
+    指定ページ（1始まり）を連続したチャンクに分け、プロセスプールでテーブル抽出する（結果はページ順）。
+    PDFオブジェクトは pickle できないため、各ワーカーがパス（またはバイト列）から該当ページだけを開き直す。
+    """
+    import pdfplumber
+
+    payload = _pdf_payload(source)
+    workers = min(os.cpu_count() or 1, len(page_numbers))
+    chunks = _page_chunks(page_numbers, workers)
+
+    records: list[dict] = []
+    failed_pages: list[int] = []
+    try:
+        with _process_pool(workers) as ex:
+            for recs, failed in ex.map(_table_records_for_pages, [payload] * len(chunks), chunks):
+                records.extend(recs)
+                failed_pages.extend(failed)
+    except Exception as e:
+        logger.warning(f"並列テーブル抽出に失敗 → 逐次処理にフォールバック: {e}")
+        with pdfplumber.open(io.BytesIO(payload) if isinstance(payload, bytes) else payload,
+                             pages=page_numbers) as pdf:
+            return _try_table_extraction(pdf)
+    return records, failed_pages
+
+
+def _table_records_for_pages(source: "str | bytes", page_numbers: list[int]) -> tuple[list[dict], list[int]]:
+    """（プロセスプール用）指定ページ（1始まり）だけを開いてテーブル抽出する"""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source,
+                         pages=page_numbers) as pdf:
+        return _try_table_extraction(pdf)
+
+
+def _should_parallelize(n_pages: int) -> bool:
+    """ページ数が多く、CPUが複数あるときだけプロセス並列にする"""
+    return n_pages >= _PARALLEL_MIN_PAGES and (os.cpu_count() or 1) > 1
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    ページ並列用のプロセスプール。
+    Streamlit のようにスレッドを持つプロセスから fork するとロックを抱えたまま子が止まることがあるため、spawn で起動する
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
 
-    return records
+
+def _pdf_payload(source: "Path | BinaryIO") -> "str | bytes":
+    """プロセスプールのワーカーへ渡せる形（パス文字列またはバイト列）にする"""
+    if isinstance(source, Path):
+        return str(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    pos = source.tell()
+    source.seek(0)
+    payload = source.read()
+    source.seek(pos)
+    return payload
+
+
+def _page_chunks(page_numbers: list[int], workers: int) -> list[list[int]]:
+    """ページ番号を workers 個以下の連続したチャンクに分ける"""
+    size = -(-len(page_numbers) // workers)
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
 
 
 def _find_header(table: list[list]) -> tuple[int | None, dict]:
@@ -386,18 +702,30 @@ def _find_header(table: list[list]) -> tuple[int | None, dict]:
         if not row:
             continue
         cells = [str(c).strip() if c else "" for c in row]
-        col_map = {}
-        for field, patterns in _COL_PATTERNS.items():
-            for j, cell in enumerate(cells):
-                if any(pat in cell for pat in patterns):
-                    col_map[field] = j
-                    break
+        col_map = _match_header(cells)
         # "code" か "name" が見つかればヘッダーと判断
         if "code" in col_map or "name" in col_map:
             return i, col_map
     return None, {}
 
 
+def _match_header(cells: list[str]) -> dict[str, int]:
+    """各フィールドについて、列名パターンに部分一致する最初のセルの列番号を返す（順序は _COL_PATTERNS 順）"""
+    found: dict[str, int] = {}
+    for j, cell in enumerate(cells):
+        for field in _match_fields(cell):
+            found.setdefault(field, j)
+        if len(found) == len(_COL_PATTERNS):
+            break  # 全フィールドが見つかったら残りのセルは見ない
+    return {field: found[field] for field in _COL_PATTERNS if field in found}
+
+
+@lru_cache(maxsize=4096)
+def _match_fields(cell: str) -> tuple[str, ...]:
+    """セル文字列が部分一致する列名パターンのフィールド名（同じ文字列は何度も現れるのでキャッシュ）"""
+    return tuple(dict.fromkeys(field for pattern, field in _PATTERN_TO_FIELD.items() if pattern in cell))
+
+
 def _row_to_record(row: list, col_map: dict) -> dict | None:
     """テーブル行を辞書に変換。銘柄コードがなければNoneを返す"""
     def cell(field):
@@ -408,10 +736,10 @@ def _row_to_record(row: list, col_map: dict) -> dict | None:
 
     # 銘柄コード: 4桁数字
     code_raw = str(cell("code") or "").strip()
-    if not re.match(r"^\d{4}$", code_raw):
+    if not _RE_CODE4.match(code_raw):
         # code列が特定できていない場合、行全体から4桁コードを探す
         for c in row:
-            if c and re.match(r"^\d{4}$", str(c).strip()):
+            if c and _RE_CODE4.match(str(c).strip()):
                 code_raw = str(c).strip()
                 break
         else:
@@ -425,12 +753,13 @@ def _row_to_record(row: list, col_map: dict) -> dict | None:
         "code":           code_raw,
         "name":           name_raw,
         "account_type":   str(cell("account_type") or "").strip(),
-        "quantity":       _to_float(cell("quantity")),
-        "avg_cost":       _to_float(cell("avg_cost")),
-        "current_price":  _to_float(cell("current_price")),
-        "assessed_value": _to_float(cell("assessed_value")),
-        "unrealized_pl":  _to_float(cell("unrealized_pl")),
-        "unrealized_pct": _to_float(cell("unrealized_pct")),
+        # 数値列は生の文字列のまま渡し、_clean_dataframe で列ごとにまとめて変換する
+        "quantity":       cell("quantity"),
+        "avg_cost":       cell("avg_cost"),
+        "current_price":  cell("current_price"),
+        "assessed_value": cell("assessed_value"),
+        "unrealized_pl":  cell("unrealized_pl"),
+        "unrealized_pct": cell("unrealized_pct"),
     }
 
 
@@ -438,96 +767,183 @@ def _row_to_record(row: list, col_map: dict) -> dict | None:
 # 内部関数: テキスト抽出（フォールバック）
 # ---------------------------------------------------------------------------
 
-def _try_text_extraction(pdf: pdfplumber.PDF) -> list[dict]:
+def _section_texts(pdf: "pdfplumber.PDF", source: "Path | BinaryIO",
+                   page_numbers: list[int], page_texts: dict[int, str | None]) -> list[str | None]:
+    """
+    セクション判定用に指定ページ（1始まり）のテキストを返す（結果はページ順）。
+    pypdfium2 があればその全文を page_texts にも入れてテキスト解析で使い回す。
+    なければレイアウト処理をしない extract_text_simple で見出しを拾うだけにし、
+    テキスト解析用の extract_text はテーブル抽出に失敗したページだけで行う。
+    """
+    if pdfium is not None:
+        texts = _extract_texts_pdfium(source, page_numbers)
+        if texts is not None:
+            page_texts.update(zip(page_numbers, texts))
+            return texts
+    if _should_parallelize(len(page_numbers)):
+        texts = _extract_texts_parallel(source, page_numbers, simple=True)
+        if texts is not None:
+            return texts
+    return [pdf.pages[n - 1].extract_text_simple() for n in page_numbers]
+
+
+def _extract_page_texts(pdf: "pdfplumber.PDF", source: "Path | BinaryIO",
+                        page_numbers: list[int]) -> list[str | None]:
+    """
+    指定ページ（1始まり）のテキストを抽出する（結果はページ順）。
+    pypdfium2 があればそれを使い、なければページ数に応じてプロセス並列または pdfplumber で逐次抽出する。
+    """
+    if pdfium is not None:
+        texts = _extract_texts_pdfium(source, page_numbers)
+        if texts is not None:
+            return texts
+    if _should_parallelize(len(page_numbers)):
+        texts = _extract_texts_parallel(source, page_numbers)
+        if texts is not None:
+            return texts
+    return [pdf.pages[n - 1].extract_text() for n in page_numbers]
+
+
+def _extract_texts_pdfium(source: "Path | BinaryIO", page_numbers: list[int]) -> list[str] | None:
+    """
+    指定ページ（1始まり）のテキストを pypdfium2 で抽出する（結果はページ順、改行は LF にそろえる）。
+    テーブルの位置情報が要らないテキスト解析用。失敗した場合は None を返す（呼び出し側で pdfplumber を使う）。
+    """
+    try:
+        doc = pdfium.PdfDocument(_pdf_payload(source))
+        try:
+            texts = []
+            for n in page_numbers:
+                page = doc[n - 1]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            doc.close()
+    except Exception as e:
+        logger.warning(f"pypdfium2 でのテキスト抽出に失敗 → pdfplumber で処理: {e}")
+        return None
+
+
+def _extract_texts_parallel(source: "Path | BinaryIO", page_numbers: list[int],
+                            simple: bool = False) -> list[str | None] | None:
     """
-    PDFテキストから銘柄情報を抽出するフォールバック。
+    指定ページ（1始まり）のテキストをプロセスプールで抽出する（結果はページ順）。
+    simple=True のときはレイアウト処理をしない extract_text_simple を使う（セクション判定用）。
+    失敗した場合は None を返す（呼び出し側で逐次処理する）。
+    """
+    payload = _pdf_payload(source)
+    workers = min(os.cpu_count() or 1, len(page_numbers))
+    chunks = _page_chunks(page_numbers, workers)
+    try:
+        with _process_pool(workers) as ex:
+            return [t for texts in ex.map(_texts_for_pages, [payload] * len(chunks), chunks, [simple] * len(chunks))
+                    for t in texts]
+    except Exception as e:
+        logger.warning(f"並列テキスト抽出に失敗 → 逐次処理にフォールバック: {e}")
+        return None
+
+
+def _texts_for_pages(source: "str | bytes", page_numbers: list[int], simple: bool = False) -> list[str | None]:
+    """（プロセスプール用）指定ページ（1始まり）だけを開いてテキストを抽出する"""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source,
+                         pages=page_numbers) as pdf:
+        return [page.extract_text_simple() if simple else page.extract_text() for page in pdf.pages]
+
+
+def _parse_text_pages(texts: Iterable[str | None]) -> dict[str, list]:
+    """
+    ページごとのテキストから銘柄情報を抽出する（{列名: 値のリスト} で返す）。
     楽天証券のPDFは値が改行で区切られていることがあるため、
     「4桁コード行」を起点に前後の行から数値を収集する。
+
+    全文を1つの文字列にまとめず1ページずつ処理し、ページをまたぐ行に備えて
+    前ページの末尾だけを次のページへ持ち越す。
     """
-    records = []
-    full_text = ""
-    for page in pdf.pages:
-        t = page.extract_text()
-        if t:
-            full_text += t + "\n"
-
-    lines = full_text.split("\n")
-
-    # --- パターン1: 1行にすべてまとまっている場合 ---
-    pattern_oneline = re.compile(
-        r"(\d{4})\s+"
-        r"([^\d▲△\n]+?)\s+"
-        r"(?:(特定|一般|NISA|つみたてNISA|成長投資枠|特定口座|一般口座)\s+)?"
-        r"([\d,]+)\s+"
-        r"([\d,]+(?:\.\d+)?)\s+"
-        r"([\d,]+(?:\.\d+)?)\s+"
-        r"([\d,]+)\s+"
-        r"([▲△]?[\d,]+(?:\.\d+)?)\s+"
-        r"([▲△]?[\d.]+)"
-    )
-    for m in pattern_oneline.finditer(full_text):
-        records.append({
-            "code":           m.group(1),
-            "name":           m.group(2).strip(),
-            "account_type":   m.group(3) or "",
-            "quantity":       _to_float(m.group(4)),
-            "avg_cost":       _to_float(m.group(5)),
-            "current_price":  _to_float(m.group(6)),
-            "assessed_value": _to_float(m.group(7)),
-            "unrealized_pl":  _to_float(m.group(8)),
-            "unrealized_pct": _to_float(m.group(9)),
-        })
-
-    if records:
-        return records
-
-    # --- パターン2: 4桁コード行を起点に周辺行から数値を収集 ---
-    # 楽天証券の一部PDFは各値が別行になっている
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        m = re.match(r"^(\d{4})$", line)  # 4桁コードだけの行
-        if not m:
-            # コードが行頭にある場合も対応
-            m = re.match(r"^(\d{4})\s+(\S.*)$", line)
-        if m:
-            code = m.group(1)
-            # 前後10行から銘柄名と数値を収集
-            window = lines[max(0, i-2):min(len(lines), i+12)]
-            name = _extract_name_from_window(window, code)
-            numbers = _extract_numbers_from_window(window)
-
-            if name and len(numbers) >= 4:
-                records.append({
-                    "code":           code,
-                    "name":           name,
-                    "account_type":   _extract_account_type(window),
-                    "quantity":       numbers[0] if len(numbers) > 0 else None,
-                    "avg_cost":       numbers[1] if len(numbers) > 1 else None,
-                    "current_price":  numbers[2] if len(numbers) > 2 else None,
-                    "assessed_value": numbers[3] if len(numbers) > 3 else None,
-                    "unrealized_pl":  numbers[4] if len(numbers) > 4 else None,
-                    "unrealized_pct": numbers[5] if len(numbers) > 5 else None,
-                })
-        i += 1
-
-    return records
+    oneline = _new_columns()    # パターン1の結果
+    windowed = _new_columns()   # パターン2の結果（パターン1で1件も取れなかった場合だけ使う）
+    tail = ""                   # パターン1: 前ページ末尾の未照合テキスト
+    lines: list[str] = []       # パターン2: 持ち越した行 + 現在ページの行
+    next_line = 0               # パターン2: lines のうち未処理の先頭行
+
+    for t in texts:
+        if not t:
+            continue
+
+        # --- パターン1: 1行にすべてまとまっている場合 ---
+        buf = tail + t + "\n"
+        end = 0
+        for m in _RE_ONELINE.finditer(buf):
+            _append_row(oneline, m.group(1), m.group(2).strip(), m.group(3) or "",
+                        *(_to_float(v) for v in m.group(4, 5, 6, 7, 8, 9)))
+            end = m.end()
+        tail = "\n".join(buf[end:].split("\n")[-_TEXT_CARRY_LINES:])
+
+        # --- パターン2: 4桁コード行を起点に周辺行から数値を収集 ---
+        # パターン1で見つかった時点で結果は使われないため、以降は走査しない
+        if oneline["code"]:
+            continue
+        lines.extend(t.split("\n"))
+        deferred = _collect_code_windows(lines, next_line, windowed, final=False)
+        keep = max(0, deferred - 2)   # 窓は2行前から始まるため、その分も持ち越す
+        lines = lines[keep:]
+        next_line = deferred - keep
+
+    if oneline["code"]:
+        return oneline
+    _collect_code_windows(lines, next_line, windowed, final=True)
+    return windowed
+
+
+def _collect_code_windows(lines: list[str], start: int, columns: dict[str, list], final: bool) -> int:
+    """
+    lines[start:] の4桁コード行を起点に、前後の行から銘柄名と数値を集めて columns に追加する。
+    楽天証券の一部PDFは各値が別行になっている。
+    final=False のときは窓（コード行の2行前〜11行後）が lines の末尾を越えるコード行を処理せず、
+    その行番号を返す（次のページの行を足してから処理する）。すべて処理した場合は len(lines) を返す。
+    """
+    text = "\n".join(lines[start:])
+    # 4桁コード行（コードだけの行 / 行頭にコード）を1回の走査で見つけ、
+    # 直前までの改行数から行番号を求める
+    i = start
+    pos = 0
+    for m in _RE_CODE_LINE.finditer(text):
+        i += text.count("\n", pos, m.start())
+        pos = m.start()
+        if not final and i + 12 > len(lines):
+            return i
+        code = m.group(1)
+        window = lines[max(0, i-2):i+12]
+        name = _extract_name_from_window(window, code)
+        numbers = _extract_numbers_from_window(window)
+
+        if name and len(numbers) >= 4:
+            # 数値は先頭から quantity, avg_cost, ... の順。足りない分は None
+            values = (numbers + [None, None])[:6]
+            _append_row(columns, code, name, _extract_account_type(window), *values)
+
+    return len(lines)
 
 
 def _extract_name_from_window(lines: list[str], code: str) -> str:
     """周辺行から銘柄名を探す"""
     for line in lines:
         line = line.strip()
-        if re.match(r"^\d{4}", line):
+        if _RE_CODE_PREFIX.match(line):
             # コード行の残り部分
-            rest = re.sub(r"^\d{4}\s*", "", line).strip()
+            rest = _RE_CODE_REST.sub("", line).strip()
             # 先頭の日本語/英字部分を銘柄名と見なす
-            m = re.match(r"^([^\d▲△,]{2,40})", rest)
+            m = _RE_NAME_HEAD.match(rest)
             if m:
                 return m.group(1).strip()
         # 日本語が多い行を銘柄名候補と見なす
-        jp_count = sum(1 for c in line if '\u3000' <= c <= '\u9fff' or '\uff00' <= c <= '\uffef')
-        if jp_count >= 2 and not re.search(r"[\d,]{4,}", line):
+        # 日本語文字が2つ見つかった時点で打ち切る
+        jp_chars = _RE_JP.finditer(line)
+        if next(jp_chars, None) and next(jp_chars, None) and not _RE_DIGITS4_LONG.search(line):
             return line[:40].strip()
     return ""
 
@@ -539,19 +955,19 @@ def _extract_numbers_from_window(lines: list[str]) -> list[float | None]:
         line = line.strip()
         # ▲/△ をマイナスに変換して数値抽出
         is_neg = line.startswith(("▲", "△"))
-        cleaned = re.sub(r"[▲△,\s円%]", "", line)
+        cleaned = line.translate(_NUM_STRIP_TABLE)
         try:
             val = float(cleaned)
             numbers.append(-val if is_neg else val)
         except ValueError:
             # 数値と非数値が混在する行（例: "1,000 特定"）からも抽出
-            for part in re.findall(r"[▲△]?[\d,]+(?:\.\d+)?", line):
-                neg = part.startswith(("▲", "△"))
+            # 符号と数字部分は正規表現のグループで分けて受け取り、1トークン1回の float() で済ませる
+            for sign, digits in _RE_NUM_TOKEN.findall(line):
                 try:
-                    numbers.append(-float(re.sub(r"[▲△,]", "", part)) if neg
-                                   else float(re.sub(r",", "", part)))
+                    val = float(digits.replace(",", ""))
                 except ValueError:
-                    pass
+                    continue  # "," だけのトークン
+                numbers.append(-val if sign else val)
     return numbers
 
 
@@ -568,36 +984,108 @@ def _extract_account_type(lines: list[str]) -> str:
 # ユーティリティ
 # ---------------------------------------------------------------------------
 
+def _new_columns() -> dict[str, list]:
+    """_SCHEMA_COLS 順の空の列リスト（行ごとの dict を作らずに列単位で値を溜める）"""
+    return {col: [] for col in _SCHEMA_COLS}
+
+
+def _append_row(columns: dict[str, list], *values) -> None:
+    """1銘柄分の値（_SCHEMA_COLS 順）を各列リストに追加する"""
+    for col_values, value in zip(columns.values(), values):
+        col_values.append(value)
+
+
+def _dedup_records(records: list[dict], seen: set[str]) -> list[dict]:
+    """銘柄コードが seen にある行を除き、残した行のコードを seen に追加する（最初の1件だけ残る）"""
+    return [rec for rec in records if not (rec["code"] in seen or seen.add(rec["code"]))]
+
+
+def _dedup_columns(columns: dict[str, list], seen: set[str]) -> dict[str, list]:
+    """_dedup_records の {列名: 値のリスト} 版（重複がなければ columns をそのまま返す）"""
+    keep = [i for i, code in enumerate(columns["code"]) if not (code in seen or seen.add(code))]
+    if len(keep) == len(columns["code"]):
+        return columns
+    return {col: [values[i] for i in keep] for col, values in columns.items()}
+
+
 def _to_float(value) -> float | None:
     """数値文字列を float に変換。▲/△ はマイナス"""
     if value is None:
         return None
-    text = str(value).strip()
+    # Excel から読んだセルなど、すでに数値ならそのまま（bool は文字列扱いで従来どおり None）
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return _to_float_str(str(value).strip())
+
+
+@lru_cache(maxsize=4096)
+def _to_float_str(text: str) -> float | None:
+    """_to_float の本体（前後の空白除去済みの文字列）。同じ数値文字列が繰り返し現れるのでキャッシュする"""
     if text in ("", "-", "―", "−"):
         return None
-    is_negative = text.startswith(_MINUS_PREFIXES)
-    cleaned = re.sub(r"[,円¥%\s▲△－−]", "", text)
+    is_negative = text[0] in _MINUS_SET
+    cleaned = text.translate(_FLOAT_STRIP_TABLE)
+    if try_float is not None:
+        value = try_float(cleaned, on_fail=None)
+        if value is None:
+            return None
+        return -value if is_negative else value
     try:
         return -float(cleaned) if is_negative else float(cleaned)
     except ValueError:
         return None
 
 
-def _clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """DataFrameのクリーニングと型変換"""
-    # 重複除去（同コードが複数ページにまたがって抽出された場合）
-    df = df.drop_duplicates(subset=["code"])
+def _to_float_series(values: "pd.Series") -> "pd.Series":
+    """_to_float の列版。文字列・数値の混在した列を一括で float64 に変換する（変換できない値は NaN）"""
+    import pandas as pd
 
-    # 数値列の型変換
-    numeric_cols = ["quantity", "avg_cost", "current_price",
-                    "assessed_value", "unrealized_pl", "unrealized_pct"]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    text = values.astype("string[pyarrow]").str.strip()
+    is_negative = text.str.startswith(_MINUS_PREFIXES).fillna(False)
+    num = pd.to_numeric(text.str.translate(_FLOAT_STRIP_TABLE), errors="coerce").astype("float64")
+    return num.where(~is_negative, -num)
+
+
+def _clean_dataframe(df: "pd.DataFrame", already_numeric: bool = False) -> "pd.DataFrame":
+    """
+    DataFrameのクリーニングと型変換。
+    already_numeric=True は数値列の値が float / None だけだと呼び出し側が分かっている場合
+    （テキスト解析だけの結果）で、文字列列の判定と _to_float_series による変換を省く。
+    """
+    import numpy as np
+    import pandas as pd
+
+    # 文字列列は Arrow 文字列列にする（重複判定・tolist() が速く、メモリも少ない）
+    str_dtypes = {col: "string[pyarrow]" for col in ("code", "name", "account_type")}
+    numeric_cols = [col for col in _NUMERIC_DTYPES if col in df.columns]
+
+    if already_numeric:
+        # 文字列列と数値列を1回の astype でまとめて変換する
+        df = df.astype(str_dtypes | {col: _NUMERIC_DTYPES[col] for col in numeric_cols})
+    else:
+        df = df.astype(str_dtypes)
+
+        # 数値列の型変換
+        # テキスト抽出の値はすでに float / None なので、文字列でない列はまとめて astype で変換する。
+        # 文字列の列（テーブル・Excel の生の値）と、astype できない値が混ざっていた場合は
+        # 符号・桁区切りを解釈する _to_float_series で1列ずつ変換する
+        # （pandas 2 では文字列の列も object 型になるため object 型も文字列の列として扱う）
+        text_cols = [col for col in numeric_cols
+                     if isinstance(df[col].dtype, pd.StringDtype) or pd.api.types.is_object_dtype(df[col].dtype)]
+        try:
+            df = df.astype({col: _NUMERIC_DTYPES[col] for col in numeric_cols if col not in text_cols})
+        except (ValueError, TypeError):
+            text_cols = numeric_cols
+        for col in text_cols:
+            df[col] = _to_float_series(df[col])
 
     # assessed_value が空の場合は計算で補完
-    mask = df["assessed_value"].isna() & df["quantity"].notna() & df["current_price"].notna()
-    df.loc[mask, "assessed_value"] = df.loc[mask, "quantity"] * df.loc[mask, "current_price"]
+    # （株数・現在値のどちらかが欠けていれば積も NaN なので、そのまま空のまま残る）
+    # 列はすべて float64 なので、インデックス合わせの要らない NumPy 配列のまま計算する
+    assessed = df["assessed_value"].to_numpy()
+    df["assessed_value"] = np.where(np.isnan(assessed),
+                                    df["quantity"].to_numpy() * df["current_price"].to_numpy(),
+                                    assessed)
 
     # unrealized_pct が空の場合は計算で補完（楽天CSVには列がないため）
     if "unrealized_pct" not in df.columns:
@@ -610,4 +1098,4 @@ def _clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     cost = df.loc[mask_pct, "assessed_value"] - df.loc[mask_pct, "unrealized_pl"]
     df.loc[mask_pct, "unrealized_pct"] = df.loc[mask_pct, "unrealized_pl"] / cost * 100
 
-    return df.reset_index(drop=True)
+    return df
@@ -0,0 +1,116 @@
+"""pdf_parser の数値変換・PDF解析のテスト"""
+
+import pandas as pd
+import pytest
+
+from pdf_parser import _SCHEMA_COLS, _clean_dataframe, _to_float, _to_float_series, parse_rakuten_pdf
+
+
+# ---------------------------------------------------------------------------
+# 数値変換
+# ---------------------------------------------------------------------------
+def test_to_float_series_fullwidth_digits():
+    """全角数字・全角の桁区切り・小数点も _to_float と同じ値に変換する"""
+    values = pd.Series(["１２３", "１，２３４．５", "▲１，０００", "－５", "￥1,000", None], dtype=object)
+    assert _to_float_series(values).tolist()[:5] == [123.0, 1234.5, -1000.0, -5.0, 1000.0]
+    assert pd.isna(_to_float_series(values).iloc[5])
+    assert [_to_float(v) for v in values] == [123.0, 1234.5, -1000.0, -5.0, 1000.0, None]
+
+
+def test_clean_dataframe_object_columns():
+    """object 型の文字列列（pandas 2 の既定）も符号・桁区切りを解釈して変換する"""
+    df = pd.DataFrame({col: pd.Series(["1,000", "▲２００"], dtype=object) for col in _SCHEMA_COLS})
+    df["code"] = ["7203", "8058"]
+    result = _clean_dataframe(df)
+    assert result["quantity"].tolist() == [1000.0, -200.0]
+    assert result["quantity"].dtype == "float64"
+
+
+# ---------------------------------------------------------------------------
+# PDF解析
+# ---------------------------------------------------------------------------
+_HEADER_ROW = "コード  銘柄名  口座  保有株数  平均取得単価  現在値  評価額  評価損益  評価損益率"
+
+
+def _write_pdf(path, pages: list[list[str]], ruled_pages: tuple[int, ...] = ()) -> None:
+    """
+    テスト用のPDFを作る。pages はページごとの行のリスト。
+    ruled_pages のページ（0始まり）は先頭行を見出し、残りの行を2つの空白区切りのセルとして罫線付きの表で描く。
+    それ以外のページは罫線のないテキストだけのページにする
+    """
+    pytest.importorskip("reportlab")
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfgen import canvas
+
+    pdfmetrics.registerFont(UnicodeCIDFont("HeiseiKakuGo-W5"))
+    c = canvas.Canvas(str(path), pagesize=landscape(A4))
+    xs = [30, 100, 230, 290, 350, 430, 500, 580, 660, 740]
+    for page_idx, lines in enumerate(pages):
+        c.setFont("HeiseiKakuGo-W5", 10)
+        if page_idx in ruled_pages:
+            c.drawString(30, 560, lines[0])
+            rows = [line.split("  ") for line in lines[1:]]
+            top = 530
+            for i, row in enumerate(rows):
+                for x, value in zip(xs, row):
+                    c.drawString(x + 3, top - i * 20 - 14, value)
+            for i in range(len(rows) + 1):
+                c.line(xs[0], top - i * 20, xs[-1], top - i * 20)
+            for x in xs:
+                c.line(x, top, x, top - len(rows) * 20)
+        else:
+            for i, line in enumerate(lines):
+                c.drawString(30, 560 - i * 18, line)
+        c.showPage()
+    c.save()
+
+
+@pytest.mark.parametrize("header", [None, "2026年10月15日現在"])
+def test_parse_rakuten_pdf_ruleless_sections(tmp_path, header):
+    """
+    罫線のないPDFでも、国内株式セクション以外（投資信託など）の行は拾わない。
+    各ページ先頭の日付（「2026年10月15日現在」）を前ページから続く銘柄コードとみなさない
+    """
+    pytest.importorskip("pdfplumber")
+    path = tmp_path / "sections.pdf"
+    pages = [
+        ["保有商品一覧 サマリー", "国内株式 1,700,000円", "投資信託 16,000円"],
+        ["■国内株式",
+         "7203  トヨタ自動車  特定  100  2,500  2,800  280,000  30,000  12.00",
+         "9432  日本電信電話  一般  1,000  150  160  160,000  10,000  6.67"],
+        ["2914  日本たばこ産業  特定  300  3,800  4,200  1,260,000  120,000  10.53"],
+        ["投資信託",
+         "0331  ｅＭＡＸＩＳ  NISA  1,000  15,000  16,000  16,000  1,000  6.67"],
+    ]
+    _write_pdf(path, [[header] + lines if header else lines for lines in pages])
+    df = parse_rakuten_pdf(path)
+    assert sorted(df["code"]) == ["2914", "7203", "9432"]
+
+
+def test_parse_rakuten_pdf_table_and_text_pages(tmp_path):
+    """
+    罫線付きの表のページと罫線のないページが混在するPDFでは、表の行とテキスト解析の行を合わせて返す。
+    両方に出てくるコードは表の1件だけ残し、数値列は float64 にそろえる
+    """
+    pytest.importorskip("pdfplumber")
+    path = tmp_path / "mixed.pdf"
+    _write_pdf(path, [
+        ["■国内株式",
+         _HEADER_ROW,
+         "7203  トヨタ自動車  特定  100  2,500  2,800  280,000  30,000  12.00",
+         "8058  三菱商事  NISA  200  3,000  2,700  540,000  ▲60,000  ▲10.00"],
+        ["9432  日本電信電話  一般  1,000  150  160  160,000  10,000  6.67",
+         "7203  トヨタ自動車  特定  999  2,500  2,800  2,797,200  299,700  12.00",
+         "2914  日本たばこ産業  特定  300  3,800  4,200  1,260,000  120,000  10.53"],
+    ], ruled_pages=(0,))
+    df = parse_rakuten_pdf(path)
+
+    assert df["code"].tolist() == ["7203", "8058", "9432", "2914"]
+    assert all(df[col].dtype == "float64" for col in _SCHEMA_COLS[3:])
+    rows = df.set_index("code")
+    assert rows.loc["7203", "quantity"] == 100.0       # 表の行を残す
+    assert rows.loc["8058", "unrealized_pl"] == -60000.0
+    assert rows.loc["9432", "quantity"] == 1000.0      # テキスト解析の行
+    assert rows.loc["2914", "assessed_value"] == 1260000.0